@@ -0,0 +1,32 @@
+import pygame
+
+
+class AreaEffects:
+    """Area-of-effect damage resolved against a SpatialHash.
+
+    Blasts queued during a frame with detonate() are resolved together, so
+    overlapping blasts (chain reactions, several mines or rockets going off
+    at once) hit each shape once, and every blast only visits nearby cells.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.blasts = []  # (position, radius) waiting for resolve()
+
+    def query(self, position, radius):
+        """All shapes in the grid whose circles overlap the blast circle."""
+        return self.grid.within(position, radius)
+
+    def detonate(self, position, radius):
+        """Queue a blast to be applied at the next resolve()."""
+        self.blasts.append((pygame.Vector2(position), radius))
+
+    def resolve(self, where=None):
+        """Return every shape hit by a queued blast, once each, in grid order, and clear the queue."""
+        hit = set()
+        for position, radius in self.blasts:
+            for shape in self.grid.within(position, radius):
+                if where is None or where(shape):
+                    hit.add(shape)
+        self.blasts.clear()
+        return sorted(hit, key=self.grid.order.__getitem__)
@@ -1,37 +1,60 @@
-import random
 import math
 import pygame
+import rng
 from circleshape import CircleShape
 from constants import LINE_WIDTH, ASTEROID_MIN_RADIUS, ASTEROID_MAX_COUNT
 from logger import log_event
+from asteroid_shapes import SHAPES
+from pool import ObjectPool, Pooled
 
-class Asteroid(CircleShape):
+class Asteroid(Pooled, CircleShape):
+    collision_layer = "asteroid"
     asteroids_group = None  # Reference to asteroids sprite group
+    commands = None  # CommandBuffer for deferred kills/spawns, set by the world
+    taken_targets = None  # Asteroids chased by rockets, set by the world
+    atlas = None  # Optional AsteroidAtlas; when set, outlines are blitted from pre-rendered frames
     
     def __init__(self, x, y, radius):
         super().__init__(x, y, radius)
-        # Generate random vertices for irregular asteroid shape
-        self.num_vertices = random.randint(8, 12)
-        self.vertex_offsets = []
-        for i in range(self.num_vertices):
-            # Random distance from center (70% to 100% of radius)
-            offset = random.uniform(0.7, 1.0)
-            self.vertex_offsets.append(offset)
+        # Pick an irregular outline from the shared shape library
+        self.shape_index = rng.cosmetic.randrange(len(SHAPES))
         self.rotation = 0
-        self.rotation_speed = random.uniform(-50, 50)  # Degrees per second
+        self.rotation_speed = rng.cosmetic.uniform(-50, 50)  # Degrees per second
 
-    def get_vertices(self):
-        vertices = []
-        angle_step = 360 / self.num_vertices
-        for i in range(self.num_vertices):
-            angle = math.radians(i * angle_step + self.rotation)
-            distance = self.radius * self.vertex_offsets[i]
-            x = self.position.x + math.cos(angle) * distance
-            y = self.position.y + math.sin(angle) * distance
-            vertices.append((x, y))
-        return vertices
+    def kill(self):
+        # Pooled asteroids are recycled, so a dead one must not stay claimed by a rocket
+        if self.taken_targets is not None:
+            self.taken_targets.discard(self)
+        super().kill()
+
+    def get_vertices(self, center_x=None, center_y=None, rotation=None):
+        """Outline vertices, at the asteroid's own position and rotation unless given."""
+        if center_x is None:
+            center_x, center_y = self.position.x, self.position.y
+        if rotation is None:
+            rotation = self.rotation
+        shape = SHAPES[self.shape_index]
+        angle = math.radians(rotation)
+        cos_r = math.cos(angle) * self.radius
+        sin_r = math.sin(angle) * self.radius
+        return [(center_x + x * cos_r - y * sin_r, center_y + x * sin_r + y * cos_r)
+                for x, y in zip(shape.unit_x, shape.unit_y)]
+
+    def get_state(self):
+        return (self.shape_index, self.rotation_speed)
+
+    def set_state(self, state):
+        self.shape_index = int(state[0])
+        self.rotation_speed = state[1]
+
+    def get_shape_key(self):
+        """Key identifying this outline independent of position and rotation."""
+        return (self.shape_index, self.radius)
 
     def draw(self, screen):
+        if self.atlas:
+            self.atlas.draw(screen, self)
+            return
         pygame.draw.polygon(screen, 'white', self.get_vertices(), LINE_WIDTH)
 
     def update(self, dt):
@@ -39,17 +62,35 @@ class Asteroid(CircleShape):
         self.rotation += self.rotation_speed * dt
         self.wrap_around_screen()
 
+    @classmethod
+    def spawn_child(cls, x, y, radius, velocity):
+        asteroid = cls.create(x, y, radius)
+        asteroid.velocity = velocity
+        return asteroid
+    
+    def _live_count(self):
+        """Asteroids there will be once pending commands are applied."""
+        count = len(self.asteroids_group)
+        if self.commands:
+            count += (self.commands.pending_spawns_of(Asteroid.spawn_child)
+                      - self.commands.pending_kills_in(self.asteroids_group))
+        return count
+    
     def split(self):
-        self.kill()
+        """Destroy this asteroid and spawn its children, deferred through `commands` when set."""
+        if self.commands:
+            self.commands.kill(self)
+        else:
+            self.kill()
         if self.radius <= ASTEROID_MIN_RADIUS:
             return
         
         # Don't split if at max asteroid count
-        if self.asteroids_group and len(self.asteroids_group) >= ASTEROID_MAX_COUNT:
+        if self.asteroids_group and self._live_count() >= ASTEROID_MAX_COUNT:
             return
             
         log_event("asteroid_split")
-        angle = random.uniform(20, 50)
+        angle = rng.gameplay.uniform(20, 50)
         velocity1 = self.velocity.rotate(angle)
         velocity2 = self.velocity.rotate(-angle)
         new_radius = self.radius - ASTEROID_MIN_RADIUS
@@ -63,7 +104,11 @@ class Asteroid(CircleShape):
         pos1 = self.position + direction1 * offset_distance
         pos2 = self.position + direction2 * offset_distance
         
-        asteroid1 = Asteroid(pos1.x, pos1.y, new_radius)
-        asteroid1.velocity = velocity1 * 1.2
-        asteroid2 = Asteroid(pos2.x, pos2.y, new_radius)
-        asteroid2.velocity = velocity2 * 1.2
\ No newline at end of file
+        for position, velocity in ((pos1, velocity1 * 1.2), (pos2, velocity2 * 1.2)):
+            if self.commands:
+                self.commands.spawn(Asteroid.spawn_child, position.x, position.y, new_radius, velocity)
+            else:
+                Asteroid.spawn_child(position.x, position.y, new_radius, velocity)
+
+
+ObjectPool(Asteroid)
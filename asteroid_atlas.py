@@ -0,0 +1,73 @@
+from collections import OrderedDict
+import pygame
+from constants import LINE_WIDTH, ASTEROID_ROTATION_STEPS, ASTEROID_ATLAS_MAX_BYTES
+
+
+class AsteroidAtlas:
+    """Pre-rendered asteroid outlines at quantised rotation angles.
+
+    Each distinct shape gets a strip of frames, rendered lazily the first time
+    an angle is needed. Whole strips are evicted least-recently-used first once
+    the atlas grows past its byte budget, so shapes that die age out.
+    """
+
+    def __init__(self, steps=ASTEROID_ROTATION_STEPS, max_bytes=ASTEROID_ATLAS_MAX_BYTES):
+        self.steps = steps
+        self.step_degrees = 360 / steps
+        self.max_bytes = max_bytes
+        self.strips = OrderedDict()  # shape key -> [frame surface or None] * steps
+        self.strip_bytes = {}
+        self.bytes_used = 0
+
+    def _render(self, asteroid, rotation):
+        """Draw one outline frame centered in its own surface."""
+        center = asteroid.radius + LINE_WIDTH
+        size = int(center * 2) + 1
+        surface = pygame.Surface((size, size))
+        surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        pygame.draw.polygon(surface, 'white', asteroid.get_vertices(center, center, rotation), LINE_WIDTH)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def _evict(self, keep):
+        """Drop least recently used strips until within budget."""
+        while self.bytes_used > self.max_bytes and len(self.strips) > 1:
+            key = next(iter(self.strips))
+            if key == keep:
+                self.strips.move_to_end(key)
+                continue
+            del self.strips[key]
+            self.bytes_used -= self.strip_bytes.pop(key)
+
+    def get_frame(self, asteroid):
+        """Get the pre-rendered frame nearest to the asteroid's current rotation."""
+        key = asteroid.get_shape_key()
+        strip = self.strips.get(key)
+        if strip is None:
+            strip = [None] * self.steps
+            self.strips[key] = strip
+            self.strip_bytes[key] = 0
+        else:
+            self.strips.move_to_end(key)
+
+        index = round(asteroid.rotation / self.step_degrees) % self.steps
+        frame = strip[index]
+        if frame is None:
+            frame = self._render(asteroid, index * self.step_degrees)
+            strip[index] = frame
+            frame_bytes = frame.get_width() * frame.get_height() * frame.get_bytesize()
+            self.strip_bytes[key] += frame_bytes
+            self.bytes_used += frame_bytes
+            self._evict(key)
+        return frame
+
+    def draw(self, screen, asteroid):
+        frame = self.get_frame(asteroid)
+        offset = frame.get_width() // 2
+        screen.blit(frame, (int(asteroid.position.x) - offset, int(asteroid.position.y) - offset))
+
+    def clear(self):
+        self.strips.clear()
+        self.strip_bytes.clear()
+        self.bytes_used = 0
@@ -0,0 +1,31 @@
+import math
+import random
+from constants import ASTEROID_SHAPE_VARIANTS, ASTEROID_SHAPE_SEED
+
+
+class AsteroidShape:
+    """Unit-radius asteroid outline shared by every asteroid that uses it."""
+    __slots__ = ('index', 'num_vertices', 'offsets', 'unit_x', 'unit_y')
+    
+    def __init__(self, index, offsets):
+        self.index = index
+        self.num_vertices = len(offsets)
+        self.offsets = offsets  # Distance from center per vertex (70% to 100% of radius)
+        # Vertex positions at rotation 0, so drawing needs one cos/sin per asteroid, not per vertex
+        angle_step = 2 * math.pi / self.num_vertices
+        self.unit_x = tuple(math.cos(i * angle_step) * offset for i, offset in enumerate(offsets))
+        self.unit_y = tuple(math.sin(i * angle_step) * offset for i, offset in enumerate(offsets))
+
+
+def _build_shapes(count, seed):
+    """Generate the shape library from its own RNG so it is identical every run."""
+    rng = random.Random(seed)
+    shapes = []
+    for index in range(count):
+        num_vertices = rng.randint(8, 12)
+        offsets = tuple(rng.uniform(0.7, 1.0) for _ in range(num_vertices))
+        shapes.append(AsteroidShape(index, offsets))
+    return tuple(shapes)
+
+
+SHAPES = _build_shapes(ASTEROID_SHAPE_VARIANTS, ASTEROID_SHAPE_SEED)
@@ -1,5 +1,5 @@
 import pygame
-import random
+import rng
 from asteroid import Asteroid
 from constants import *
 
@@ -35,7 +35,7 @@ class AsteroidField(pygame.sprite.Sprite):
         self.spawn_timer = 0.0
 
     def spawn(self, radius, position, velocity):
-        asteroid = Asteroid(position.x, position.y, radius)
+        asteroid = Asteroid.create(position.x, position.y, radius)
         asteroid.velocity = velocity
 
     def update(self, dt):
@@ -48,10 +48,10 @@ class AsteroidField(pygame.sprite.Sprite):
                 return
 
             # spawn a new asteroid at a random edge
-            edge = random.choice(self.edges)
-            speed = random.randint(40, 100)
+            edge = rng.gameplay.choice(self.edges)
+            speed = rng.gameplay.randint(40, 100)
             velocity = edge[0] * speed
-            velocity = velocity.rotate(random.randint(-30, 30))
-            position = edge[1](random.uniform(0, 1))
-            kind = random.randint(1, ASTEROID_KINDS)
+            velocity = velocity.rotate(rng.gameplay.randint(-30, 30))
+            position = edge[1](rng.gameplay.uniform(0, 1))
+            kind = rng.gameplay.randint(1, ASTEROID_KINDS)
             self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
\ No newline at end of file
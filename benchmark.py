@@ -0,0 +1,208 @@
+import argparse
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+import pygame
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, SIMULATION_DT, ASTEROID_ATLAS_ENABLED,
+                       ASTEROID_MAX_COUNT, ASTEROID_MAX_RADIUS, ROCKET_MAX_AMMO, MINE_EXPLOSION_RADIUS)
+from logger import configure_event_log
+from player_input import PlayerInput
+from world import World
+from asteroid import Asteroid
+from asteroid_atlas import AsteroidAtlas
+from mine import MineExplosion
+from starfield import Starfield
+from ui import UI
+
+DEFAULT_FRAMES = 600
+DEFAULT_SEED = 1234
+DEFAULT_TOLERANCE = 0.15  # Allowed relative slowdown (or memory growth) against the baseline
+MINE_WAVE_FRAMES = 60  # Frames between waves of simultaneous mine explosions
+MINE_WAVE_SIZE = 10
+
+# Metric -> True when bigger is better
+METRICS = {"updates_per_sec": True, "render_ms": False, "p99_frame_ms": False, "peak_kb": False}
+
+
+def fill_field(world):
+    """Top the field up to the asteroid cap with the largest asteroids, clear of the player."""
+    while len(world.asteroids) < ASTEROID_MAX_COUNT:
+        position = pygame.Vector2(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT))
+        if position.distance_to(world.player.position) < ASTEROID_MAX_RADIUS * 3:
+            continue
+        velocity = pygame.Vector2(random.uniform(40, 100), 0).rotate(random.uniform(0, 360))
+        Asteroid.spawn_child(position.x, position.y, ASTEROID_MAX_RADIUS, velocity)
+
+
+def crowded_world(seed):
+    """A world with a full asteroid field and a player that cannot die."""
+    world = World(seed)
+    world.player.invincibility_timer = 1e9
+    fill_field(world)
+    return world
+
+
+def max_field(world, frame):
+    """Nothing but the densest asteroid field the game allows."""
+    fill_field(world)
+    return PlayerInput()
+
+
+def sustained_fire(world, frame):
+    """Shots every cooldown, sweeping round so they spread over the field."""
+    return PlayerInput(shoot=True, rotate_left=True)
+
+
+def rocket_volleys(world, frame):
+    """Homing rocket volleys as fast as the cooldown allows into a field kept full."""
+    fill_field(world)
+    world.player.rocket_weapon.add_ammo(ROCKET_MAX_AMMO)
+    return PlayerInput(fire_rockets=True, rotate_right=True)
+
+
+def mine_explosions(world, frame):
+    """Waves of simultaneous mine explosions spread over the screen."""
+    if frame % MINE_WAVE_FRAMES == 0:
+        for _ in range(MINE_WAVE_SIZE):
+            MineExplosion(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT),
+                          MINE_EXPLOSION_RADIUS)
+    return PlayerInput()
+
+
+def boost_trail(world, frame):
+    """Speed boost engine trail at full intensity, kept on for the whole run."""
+    world.player.activate_speed_boost()
+    return PlayerInput(thrust=True, rotate_right=frame % 120 < 60)
+
+
+SCENARIOS = {
+    "max_field": max_field,
+    "sustained_fire": sustained_fire,
+    "rocket_volleys": rocket_volleys,
+    "mine_explosions": mine_explosions,
+    "boost_trail": boost_trail,
+}
+
+
+def render(screen, world, starfield, ui, dt):
+    """Draw a frame the way main.py does while playing, onto an off-screen surface."""
+    player = world.player
+    starfield.update(dt, player.velocity)
+    screen.fill('black')
+    starfield.draw(screen)
+    for drawable_sprite in world.drawable:
+        drawable_sprite.draw(screen)
+    ui.draw_hud(screen, world.score, world.lives, player.get_warp_cooldown(),
+                player.is_warp_charging(), player.get_warp_charge_remaining(),
+                player.has_active_shield(), player.get_speed_boost_remaining(),
+                player.get_rocket_ammo(), player.get_mine_ammo())
+
+
+def run_scenario(scenario, frames, seed, dt=SIMULATION_DT, timed=True):
+    """Play one scenario from a fixed seed; returns per-frame (update, render) seconds."""
+    random.seed(seed)  # Scenario scripts draw from the random module
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    ui = UI()
+    world = crowded_world(seed)
+    starfield = Starfield()  # After the world, so its stars come from the seeded cosmetic stream
+    clock = time.perf_counter
+    samples = []
+    for frame in range(frames):
+        inputs = scenario(world, frame)
+        start = clock()
+        world.step(dt, inputs)
+        stepped = clock()
+        render(screen, world, starfield, ui, dt)
+        if timed:
+            samples.append((stepped - start, clock() - stepped))
+    return samples
+
+
+def measure(scenario, frames, seed):
+    """Timed pass, then a separate tracemalloc pass so tracing does not skew the timings."""
+    samples = run_scenario(scenario, frames, seed)
+    update_seconds = sum(update for update, _ in samples)
+    frame_times = sorted(update + draw for update, draw in samples)
+    p99 = frame_times[max(0, math.ceil(len(frame_times) * 0.99) - 1)]
+
+    tracemalloc.start()
+    run_scenario(scenario, frames, seed, timed=False)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "updates_per_sec": frames / update_seconds,
+        "render_ms": 1000 * sum(draw for _, draw in samples) / frames,
+        "p99_frame_ms": 1000 * p99,
+        "peak_kb": peak / 1024,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """List (scenario, metric, baseline, current) for every metric worse than the tolerance allows."""
+    regressions = []
+    for name, metrics in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if metric not in reference:
+                continue
+            before, now = reference[metric], metrics[metric]
+            if higher_is_better:
+                worse = now < before * (1 - tolerance)
+            else:
+                worse = now > before * (1 + tolerance)
+            if worse:
+                regressions.append((name, metric, before, now))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scripted gameplay scenarios and report their cost.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run, may be repeated (default: all)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="fixed steps per scenario")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="seed for the random module")
+    parser.add_argument("--baseline", help="baseline JSON to compare against; exits 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative regression per metric (0.15 = 15%%)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write these results as a new baseline")
+    parser.add_argument("--event-log", action="store_true",
+                        help="write world events to game_events.jsonl (off by default, it slows the run down)")
+    args = parser.parse_args()
+    configure_event_log(args.event_log)
+
+    pygame.font.init()
+    if ASTEROID_ATLAS_ENABLED:
+        Asteroid.atlas = AsteroidAtlas()
+
+    results = {}
+    print(f"{'scenario':<18}{'updates/s':>12}{'render ms':>12}{'p99 ms':>10}{'peak KiB':>12}")
+    for name in args.scenario or SCENARIOS:
+        metrics = results[name] = measure(SCENARIOS[name], args.frames, args.seed)
+        print(f"{name:<18}{metrics['updates_per_sec']:>12.0f}{metrics['render_ms']:>12.3f}"
+              f"{metrics['p99_frame_ms']:>10.3f}{metrics['peak_kb']:>12.0f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"frames": args.frames, "seed": args.seed, "scenarios": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline.get("frames"), baseline.get("seed")) != (args.frames, args.seed):
+            print("warning: baseline was recorded with different --frames/--seed")
+        regressions = compare(results, baseline["scenarios"], args.tolerance)
+        for name, metric, before, now in regressions:
+            print(f"REGRESSION {name} {metric}: {before:.3f} -> {now:.3f}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,21 @@
+import itertools
 import pygame
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, LINE_WIDTH
+
+
+def circle_rect(x, y, reach):
+    """Integer rect covering a circle of radius `reach`, padded for rounding."""
+    left = int(x - reach) - 1
+    top = int(y - reach) - 1
+    size = int(reach * 2) + 3
+    return pygame.Rect(left, top, size, size)
+
 
 # Base class for game objects
 class CircleShape(pygame.sprite.Sprite):
+    collision_layer = None  # Layer name for the CollisionSystem, None to never collide
+    _next_id = itertools.count(1)  # Process-wide, so ids stay unique across games
+
     def __init__(self, x, y, radius):
         # we will be using this later
         if hasattr(self, "containers"):
@@ -13,6 +26,7 @@ class CircleShape(pygame.sprite.Sprite):
         self.position = pygame.Vector2(x, y)
         self.velocity = pygame.Vector2(0, 0)
         self.radius = radius
+        self.entity_id = next(CircleShape._next_id)
 
     def collides_with(self, other):
         return self.position.distance_to(other.position) < (self.radius + other.radius)
@@ -32,6 +46,18 @@ class CircleShape(pygame.sprite.Sprite):
         # must override
         pass
 
+    def get_draw_rects(self):
+        """Screen rects covering everything draw() paints (for dirty-rect presentation)."""
+        return [circle_rect(self.position.x, self.position.y, self.radius + LINE_WIDTH)]
+
     def update(self, dt):
         # must override
+        pass
+
+    def get_state(self):
+        """Numbers World.snapshot() saves besides position, velocity, radius and rotation."""
+        return ()
+
+    def set_state(self, state):
+        """Put back what get_state() returned (state may carry unused trailing slots)."""
         pass
\ No newline at end of file
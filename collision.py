@@ -0,0 +1,107 @@
+import time
+import pygame
+import profiler
+from constants import BROADPHASE_CELL_SIZE
+from spatial_hash import SpatialHash
+
+
+def circles_overlap(a, b):
+    return a.collides_with(b)
+
+
+class CollisionSystem:
+    """Layered collision pipeline: one broadphase pass, then contact handlers.
+
+    Entity classes declare a `collision_layer`. Registering a handler for a
+    pair of layers adds that pair to the layer matrix; layers that appear in
+    no pair are never inserted or tested. Each run buckets every entity on an
+    active layer into one SpatialHash, collects the candidate pairs the
+    matrix allows, then dispatches them in handler registration order.
+    Handlers only see pairs whose entities are both still live (by default
+    alive(); pass a CommandBuffer's is_live when kills are deferred).
+
+    An entity may define `collision_reach` when it can touch things further
+    out than its radius (e.g. the player's ship corners).
+    """
+
+    def __init__(self, entities, cell_size=BROADPHASE_CELL_SIZE, live=pygame.sprite.Sprite.alive):
+        self.entities = entities  # Group scanned for sprites with a collision_layer
+        self.live = live
+        self.grid = SpatialHash(cell_size)
+        self.matrix = {}  # (layer, layer) -> (priority, handler, test, swapped)
+        self.labels = []  # Profiler phase name per priority
+        self.active_layers = set()
+        self.stats = {"entities": 0, "pair_tests": 0, "naive_pair_tests": 0, "contacts": 0, "seconds": 0.0}
+
+    def register(self, layer_a, layer_b, handler, test=circles_overlap):
+        """Call handler(a, b) for every overlapping pair from layer_a and layer_b.
+
+        `test(a, b)` is the narrowphase check, plain circle overlap by default.
+        Pairs are resolved in the order their handlers were registered.
+        """
+        priority = len(self.labels)
+        self.labels.append(f"collide {layer_a}/{layer_b}")
+        self.matrix[(layer_a, layer_b)] = (priority, handler, test, False)
+        if layer_a != layer_b:
+            self.matrix[(layer_b, layer_a)] = (priority, handler, test, True)
+        self.active_layers.update((layer_a, layer_b))
+
+    def _reach(self, entity):
+        return getattr(entity, "collision_reach", entity.radius)
+
+    def run(self):
+        """Find and resolve every contact for this frame."""
+        start = time.perf_counter()
+        grid = self.grid
+        grid.reset_stats()
+        grid.clear()
+
+        layer_sizes = {}
+        for entity in self.entities:
+            layer = getattr(entity, "collision_layer", None)
+            if layer in self.active_layers:
+                grid.insert(entity, self._reach(entity))
+                layer_sizes[layer] = layer_sizes.get(layer, 0) + 1
+
+        # Broadphase: every pair sharing a cell, each pair once, filtered by the layer matrix
+        order = grid.order
+        contacts = []
+        for entity, entity_order in order.items():
+            for other in grid.query(entity.position, self._reach(entity), exclude=entity):
+                if order[other] < entity_order:
+                    continue
+                entry = self.matrix.get((entity.collision_layer, other.collision_layer))
+                if entry is None:
+                    continue
+                priority, handler, test, swapped = entry
+                a, b = (other, entity) if swapped else (entity, other)
+                contacts.append((priority, order[a], order[b], a, b, handler, test))
+        contacts.sort(key=lambda contact: contact[:3])
+        profiler.record("broadphase", start, time.perf_counter() - start)
+
+        live = self.live
+        resolved = 0
+        # Contacts are sorted by priority, so each handler's pairs form one block to time
+        timing = profiler.is_enabled()
+        block, block_start = None, 0.0
+        for priority, _, _, a, b, handler, test in contacts:
+            if timing and priority != block:
+                now = time.perf_counter()
+                if block is not None:
+                    profiler.record(self.labels[block], block_start, now - block_start)
+                block, block_start = priority, now
+            if live(a) and live(b) and test(a, b):
+                handler(a, b)
+                resolved += 1
+        if block is not None:
+            profiler.record(self.labels[block], block_start, time.perf_counter() - block_start)
+
+        naive = 0
+        for layer_a, layer_b in self.matrix:
+            if layer_a < layer_b:
+                naive += layer_sizes.get(layer_a, 0) * layer_sizes.get(layer_b, 0)
+            elif layer_a == layer_b:
+                count = layer_sizes.get(layer_a, 0)
+                naive += count * (count - 1) // 2
+        self.stats.update(entities=len(order), pair_tests=grid.pair_tests, naive_pair_tests=naive,
+                          contacts=resolved, seconds=time.perf_counter() - start)
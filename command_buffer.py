@@ -0,0 +1,42 @@
+class CommandBuffer:
+    """Spawns and kills recorded during a frame, applied together at a sync point.
+
+    Gameplay code records structural changes instead of making them on the
+    spot, so sprite groups never change while something is walking them and
+    sprites killed this frame stop interacting straight away (see is_live).
+    flush() applies every kill, then every spawn, in the order recorded.
+    """
+
+    def __init__(self):
+        self.kills = {}  # Sprite -> None; a dict keeps recording order and drops repeats
+        self.spawns = []  # (factory, args)
+        self.spawn_counts = {}  # Factory -> pending spawns, for population caps
+
+    def kill(self, sprite):
+        """Remove the sprite from all its groups at the next flush."""
+        self.kills[sprite] = None
+
+    def spawn(self, factory, *args):
+        """Call factory(*args) at the next flush; factories add themselves to groups."""
+        self.spawns.append((factory, args))
+        self.spawn_counts[factory] = self.spawn_counts.get(factory, 0) + 1
+
+    def is_live(self, sprite):
+        """True if the sprite is in a group and no kill is pending for it."""
+        return sprite.alive() and sprite not in self.kills
+
+    def pending_kills_in(self, group):
+        return sum(1 for sprite in self.kills if group.has(sprite))
+
+    def pending_spawns_of(self, factory):
+        return self.spawn_counts.get(factory, 0)
+
+    def flush(self):
+        """Apply all recorded kills, then all spawns. Spawns recorded while flushing wait for the next flush."""
+        kills, spawns = self.kills, self.spawns
+        self.kills, self.spawns, self.spawn_counts = {}, [], {}
+        for sprite in kills:
+            sprite.kill()
+        for factory, args in spawns:
+            factory(*args)
+        return len(kills) + len(spawns)
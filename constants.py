@@ -4,6 +4,7 @@ PLAYER_RADIUS = 20
 PLAYER_SPEED = 200
 PLAYER_TURN_SPEED = 300
 LINE_WIDTH = 2
+SIMULATION_DT = 1 / 60  # Fixed timestep for headless simulation
 
 ASTEROID_MIN_RADIUS = 20
 ASTEROID_KINDS = 3
@@ -11,6 +12,17 @@ ASTEROID_SPAWN_RATE_SECONDS = 0.8
 ASTEROID_MAX_RADIUS = ASTEROID_MIN_RADIUS * ASTEROID_KINDS
 ASTEROID_MAX_COUNT = 15
 
+# Asteroid rendering
+ASTEROID_SHAPE_VARIANTS = 32  # Distinct outlines shared by all asteroids
+ASTEROID_SHAPE_SEED = 1979  # Seed for generating the shape library
+ASTEROID_ATLAS_ENABLED = True  # Blit pre-rendered outlines instead of drawing polygons
+ASTEROID_ROTATION_STEPS = 64  # Rotation frames per asteroid shape in the atlas
+ASTEROID_ATLAS_MAX_BYTES = 32 * 1024 * 1024  # Atlas memory budget before LRU eviction
+
+# Collision broadphase
+BROADPHASE_CELL_SIZE = ASTEROID_MAX_RADIUS * 2  # Spatial hash cell edge in pixels
+BROADPHASE_LOG_INTERVAL_FRAMES = 600  # Frames summed into each "broadphase" event (per-frame counts are in CollisionSystem.stats)
+
 SHOT_RADIUS = 1.5
 PLAYER_SHOOT_SPEED = 500
 PLAYER_SHOOT_COOLDOWN_SECONDS = 0.3
@@ -65,6 +77,22 @@ BOOST_TRAIL_LENGTH_MIN = 20
 BOOST_TRAIL_LENGTH_MAX = 40
 BOOST_TRAIL_OFFSET = 3.0  # Multiplier of player radius for emission offset
 
+# Particles
+PARTICLE_CAPACITY = 4096  # Initial particle array size (grows by doubling)
+PARTICLE_DRAG = 0.98  # Velocity multiplier per update
+PARTICLE_FADE_COLOR = (30, 30, 30)  # Particles fade to dark
+
+# Sprite cache (pre-rendered glows and rings)
+SPRITE_CACHE_MAX_ENTRIES = 256  # Least recently used sprites are dropped past this
+SPRITE_CACHE_RADIUS_BUCKET = 2  # Ring radii are rounded to this many pixels
+GLOW_RADIUS_BUCKET = 2  # Glow radii are rounded to this many pixels
+SPRITE_CACHE_ALPHA_BUCKET = 8  # Ring alphas are rounded to this many levels
+
+# Presentation
+DIRTY_RECT_PRESENTATION = False  # Update only changed screen areas instead of flipping the whole frame
+DIRTY_RECT_MAX_COVERAGE = 0.5  # Fraction of the screen past which a full flip is cheaper
+DIRTY_RECT_TILE_SIZE = 32  # Particles are grouped into dirty tiles of this size
+
 # Starfield Background
 STAR_COUNT = 150
 STAR_LAYERS = 3  # Number of parallax layers (far to near)
@@ -96,4 +124,24 @@ MINE_DRIFT_SPEED = 20  # Slow drift speed
 MINE_LIFETIME = 15.0  # Seconds before mine expires
 MINE_RADIUS = 12
 MINE_EXPLOSION_RADIUS = 120  # Area of effect radius
-MINE_ARM_TIME = 0.5  # Seconds before mine becomes active
\ No newline at end of file
+MINE_ARM_TIME = 0.5  # Seconds before mine becomes active
+
+# Frame profiler
+PROFILER_ENABLED = False  # Start with phase timing on; F3 toggles it and the overlay in game
+PROFILER_HISTORY_FRAMES = 300  # Frames in the rolling mean/p95/p99 window
+PROFILER_TRACE_MAX_EVENTS = 200000  # Spans kept for the Chrome trace, oldest dropped first
+PROFILER_TRACE_FILE = "frame_trace.json"  # Written when F4 is pressed
+PROFILER_OVERLAY_REFRESH_FRAMES = 30  # Frames between overlay text refreshes
+
+# Input recording
+INPUT_RECORDING = False  # Record every game's inputs so it can be replayed with replay.py
+INPUT_RECORDING_DIR = "recordings"  # One .pyin file per game
+REPLAY_ARCHIVE = False  # Record seekable replay archives (.pyrp) instead, with world keyframes
+REPLAY_KEYFRAME_SECONDS = 10.0  # Game time between keyframes; seeking steps at most this far
+
+# Object pools
+POOL_MAX_SIZE = 256  # Killed sprites kept for reuse, per pooled class
+
+# State log
+STATE_LOG_COLUMNAR = False  # Write snapshots as .npy columns instead of game_state.jsonl
+STATE_LOG_COLUMNAR_DIR = "game_state_columns"  # Directory for the column files
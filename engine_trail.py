@@ -1,7 +1,7 @@
-import random
 import math
-from particle import Particle, LineParticle
+import rng
 from particle_effect import ParticleEffect
+from particle_system import PARTICLE_LINE
 from constants import (TRAIL_PARTICLE_COUNT, TRAIL_SPREAD, TRAIL_SPEED_MIN, TRAIL_SPEED_MAX,
                        TRAIL_LIFETIME_MIN, TRAIL_LIFETIME_MAX, TRAIL_SIZE_MIN, TRAIL_SIZE_MAX,
                        BOOST_TRAIL_PARTICLE_COUNT, BOOST_TRAIL_SPREAD, BOOST_TRAIL_SPEED_MIN,
@@ -21,31 +21,36 @@ class EngineTrail(ParticleEffect):
 
     def emit(self, x, y, direction, intensity=1.0, boosted=False):
         """Emit particles in the given direction."""
+        if not self.enabled:
+            return
         base_angle = math.atan2(direction.y, direction.x)
         colors = self.TRAIL_COLORS
         
+        speeds, angles, lifetimes, sizes, trail_colors = [], [], [], [], []
         for _ in range(TRAIL_PARTICLE_COUNT):
-            angle = base_angle + random.uniform(-TRAIL_SPREAD, TRAIL_SPREAD)
-            speed = random.uniform(TRAIL_SPEED_MIN, TRAIL_SPEED_MAX) * intensity
-            lifetime = random.uniform(TRAIL_LIFETIME_MIN, TRAIL_LIFETIME_MAX)
-            color = random.choice(colors)
-            size = random.uniform(TRAIL_SIZE_MIN, TRAIL_SIZE_MAX) * intensity
-            
-            particle = Particle.create_radial(x, y, color, speed, angle, lifetime, size)
-            self._add_particle(particle)
+            angles.append(base_angle + rng.cosmetic.uniform(-TRAIL_SPREAD, TRAIL_SPREAD))
+            speeds.append(rng.cosmetic.uniform(TRAIL_SPEED_MIN, TRAIL_SPEED_MAX) * intensity)
+            lifetimes.append(rng.cosmetic.uniform(TRAIL_LIFETIME_MIN, TRAIL_LIFETIME_MAX))
+            trail_colors.append(rng.cosmetic.choice(colors))
+            sizes.append(rng.cosmetic.uniform(TRAIL_SIZE_MIN, TRAIL_SIZE_MAX) * intensity)
+        
+        self._emit_radial(x, y, speeds, angles, lifetimes, sizes, trail_colors)
 
     def emit_directed(self, x, y, direction, intensity=1.0):
         """Emit line particles in a specific direction with minimal spread (for speed boost)."""
+        if not self.enabled:
+            return
         base_angle = math.atan2(direction.y, direction.x)
         colors = self.BOOST_COLORS
         
+        speeds, angles, lifetimes, sizes, lengths, trail_colors = [], [], [], [], [], []
         for _ in range(BOOST_TRAIL_PARTICLE_COUNT):
-            angle = base_angle + random.uniform(-BOOST_TRAIL_SPREAD, BOOST_TRAIL_SPREAD)
-            speed = random.uniform(BOOST_TRAIL_SPEED_MIN, BOOST_TRAIL_SPEED_MAX) * intensity
-            lifetime = random.uniform(BOOST_TRAIL_LIFETIME_MIN, BOOST_TRAIL_LIFETIME_MAX)
-            color = random.choice(colors)
-            size = random.uniform(BOOST_TRAIL_SIZE_MIN, BOOST_TRAIL_SIZE_MAX)
-            length = random.uniform(BOOST_TRAIL_LENGTH_MIN, BOOST_TRAIL_LENGTH_MAX) * intensity
-            
-            particle = LineParticle.create_radial(x, y, color, speed, angle, lifetime, size, length)
-            self._add_particle(particle)
+            angles.append(base_angle + rng.cosmetic.uniform(-BOOST_TRAIL_SPREAD, BOOST_TRAIL_SPREAD))
+            speeds.append(rng.cosmetic.uniform(BOOST_TRAIL_SPEED_MIN, BOOST_TRAIL_SPEED_MAX) * intensity)
+            lifetimes.append(rng.cosmetic.uniform(BOOST_TRAIL_LIFETIME_MIN, BOOST_TRAIL_LIFETIME_MAX))
+            trail_colors.append(rng.cosmetic.choice(colors))
+            sizes.append(rng.cosmetic.uniform(BOOST_TRAIL_SIZE_MIN, BOOST_TRAIL_SIZE_MAX))
+            lengths.append(rng.cosmetic.uniform(BOOST_TRAIL_LENGTH_MIN, BOOST_TRAIL_LENGTH_MAX) * intensity)
+        
+        self._emit_radial(x, y, speeds, angles, lifetimes, sizes, trail_colors,
+                          kind=PARTICLE_LINE, lengths=lengths)
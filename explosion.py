@@ -1,10 +1,10 @@
-import random
 import math
-from particle import Particle
+import rng
 from particle_effect import ParticleEffect
+from pool import ObjectPool, Pooled
 
 
-class Explosion(ParticleEffect):
+class Explosion(Pooled, ParticleEffect):
     """One-time burst explosion effect that auto-destroys when complete."""
     
     def __init__(self, x, y, colors, particle_count, speed_range, lifetime):
@@ -16,17 +16,18 @@ class Explosion(ParticleEffect):
         if isinstance(colors, str):
             colors = [colors]
         lifetime_range = (lifetime * 0.5, lifetime)
+        speeds, angles, lifetimes, sizes, burst_colors = [], [], [], [], []
         for _ in range(count):
-            color = random.choice(colors)
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(speed_range[0], speed_range[1])
-            life = random.uniform(lifetime_range[0], lifetime_range[1])
-            particle = Particle.create_radial(x, y, color, speed, angle, life)
-            self._add_particle(particle)
+            burst_colors.append(rng.cosmetic.choice(colors))
+            angles.append(rng.cosmetic.uniform(0, 2 * math.pi))
+            speeds.append(rng.cosmetic.uniform(speed_range[0], speed_range[1]))
+            lifetimes.append(rng.cosmetic.uniform(lifetime_range[0], lifetime_range[1]))
+            sizes.append(rng.cosmetic.uniform(2, 5))
+        self._emit_radial(x, y, speeds, angles, lifetimes, sizes, burst_colors)
 
     def update(self, dt):
         super().update(dt)
-        if len(self.particles) == 0:
+        if not self.has_particles():
             self.kill()
 
 
@@ -54,3 +55,8 @@ class ShieldExplosion(Explosion):
     def __init__(self, x, y):
         super().__init__(x, y, colors=['deepskyblue', 'cyan', 'white'], 
                         particle_count=35, speed_range=(80, 200), lifetime=0.5)
+
+
+ObjectPool(AsteroidExplosion)
+ObjectPool(ShipExplosion)
+ObjectPool(ShieldExplosion)
@@ -0,0 +1,73 @@
+import os
+import struct
+import numpy as np
+from player_input import PlayerInput
+
+# File layout: one header, then one fixed-size record per simulated frame
+INPUT_MAGIC = b"PYASTIN1"
+INPUT_HEADER = struct.Struct("<8sq")  # Magic, world seed
+INPUT_RECORD = struct.Struct("<Bd")  # PlayerInput bitmask, dt in seconds (exact, so replays match)
+INPUT_RECORD_DTYPE = np.dtype([("bits", "u1"), ("dt", "<f8")])  # Same layout, unpadded
+
+_FLUSH_FRAMES = 60  # Records buffered before a write, so a crash loses at most a second
+
+
+class InputRecorder:
+    """Appends each frame's inputs and dt to a recording that replays the game exactly.
+
+    The world must have been created with the same seed that is written to
+    the header.
+    """
+
+    def __init__(self, path, seed):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(INPUT_HEADER.pack(INPUT_MAGIC, seed))
+        self.pending = []
+        self.frames = 0
+
+    def record(self, inputs, dt):
+        self.pending.append(INPUT_RECORD.pack(inputs.to_bits(), dt))
+        self.frames += 1
+        if len(self.pending) >= _FLUSH_FRAMES:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.file.write(b"".join(self.pending))
+            self.pending.clear()
+        self.file.flush()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+
+class InputRecording:
+    """A recording opened for playback; iterate it for (PlayerInput, dt) per frame.
+
+    A trailing partial record (e.g. from a crash mid-write) is ignored.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            header = f.read(INPUT_HEADER.size)
+        if len(header) < INPUT_HEADER.size:
+            raise ValueError(f"{path} is too short to be an input recording")
+        magic, self.seed = INPUT_HEADER.unpack(header)
+        if magic != INPUT_MAGIC:
+            raise ValueError(f"{path} is not an input recording")
+        frames = (os.path.getsize(path) - INPUT_HEADER.size) // INPUT_RECORD_DTYPE.itemsize
+        self.records = np.fromfile(path, dtype=INPUT_RECORD_DTYPE, count=frames, offset=INPUT_HEADER.size)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        for bits, dt in zip(self.records["bits"].tolist(), self.records["dt"].tolist()):
+            yield PlayerInput.from_bits(bits), dt
@@ -1,139 +1,307 @@
-import inspect
+import atexit
 import json
 import math
+import os
+import queue
+import threading
+import time
 from datetime import datetime
+from snapshot_store import build_columns
 
-__all__ = ["log_state", "log_event"]
+__all__ = [
+    "log_state", "log_event", "flush", "shutdown", "get_dropped_count",
+    "register_group", "register_entity", "register_screen", "clear_registry",
+    "configure_state_log", "configure_event_log", "set_state_sink", "set_frame",
+]
 
 _FPS = 60
-_MAX_SECONDS = 16
-_SPRITE_SAMPLE_LIMIT = 10  # Maximum number of sprites to log per group
 
-_frame_count = 0
-_state_log_initialized = False
-_event_log_initialized = False
-_start_time = datetime.now()
+_QUEUE_SIZE = 10000  # Entries waiting for the writer; more than this are dropped
+_BATCH_SIZE = 512  # Maximum entries written per batch
+_FLUSH_INTERVAL = 0.5  # Seconds between file flushes
+_MAX_FILE_BYTES = 32 * 1024 * 1024  # Rotate a log file once it grows past this
+_BACKUP_COUNT = 3  # Rotated files kept per log (name.jsonl.1 is the newest)
+
+_STATE_LOG = "game_state.jsonl"
+_EVENT_LOG = "game_events.jsonl"
+
+_frame_count = 0  # Calls to log_state(), which paces and numbers state snapshots
+_event_frame = 0  # World.frame of the step being simulated, stamped on events
+_start_time = time.time()
+
+# What log_state() snapshots, handed over explicitly by the game
+_groups = {}
+_entities = {}
+_screen_size = []
+_state_interval = _FPS  # Frames between snapshots
+_sample_limit = None  # Sprites recorded per group, None for full snapshots
+_state_sink = None  # Replaces the JSON state log when set (see set_state_sink)
+_events_enabled = True
+
+
+class _LogWriter(threading.Thread):
+    """Writes queued log entries from a background thread.
+    
+    The game thread only enqueues (timestamp, entry) pairs; formatting,
+    JSON encoding, batching, flushing and rotation all happen here.
+    Entries addressed to a sink object instead of a path are handed to
+    its write() method unchanged.
+    """
+    
+    def __init__(self):
+        super().__init__(name="log-writer", daemon=True)
+        self.queue = queue.Queue(maxsize=_QUEUE_SIZE)
+        self.dropped = 0
+        self.files = {}
+        self.sizes = {}
+        self.sinks = []
+    
+    def submit(self, path, wall_time, entry):
+        try:
+            self.queue.put_nowait((path, wall_time, entry))
+        except queue.Full:
+            self.dropped += 1
+    
+    def _open(self, path):
+        """New log file on each run."""
+        self.files[path] = open(path, "w")
+        self.sizes[path] = 0
+    
+    def _rotate(self, path):
+        self.files[path].close()
+        for index in range(_BACKUP_COUNT - 1, 0, -1):
+            older = f"{path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{path}.{index + 1}")
+        if _BACKUP_COUNT > 0:
+            os.replace(path, f"{path}.1")
+        self._open(path)
+    
+    def _write(self, path, wall_time, entry):
+        if not isinstance(path, str):
+            if path not in self.sinks:
+                self.sinks.append(path)
+            path.write(entry)
+            return
+        now = datetime.fromtimestamp(wall_time)
+        line = json.dumps({
+            "timestamp": now.strftime("%H:%M:%S.%f")[:-3],
+            "elapsed_s": math.floor(wall_time - _start_time),
+            **entry,
+        }) + "\n"
+        if path not in self.files:
+            self._open(path)
+        elif self.sizes[path] + len(line) > _MAX_FILE_BYTES:
+            self._rotate(path)
+        self.files[path].write(line)
+        self.sizes[path] += len(line)
+    
+    def _flush_files(self):
+        for f in self.files.values():
+            f.flush()
+        for sink in self.sinks:
+            sink.flush()
+    
+    def run(self):
+        last_flush = time.monotonic()
+        running = True
+        while running:
+            try:
+                batch = [self.queue.get(timeout=_FLUSH_INTERVAL)]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < _BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            for path, wall_time, entry in batch:
+                if path is None:  # Stop or flush request
+                    self._flush_files()
+                    if entry == "stop":
+                        running = False
+                else:
+                    self._write(path, wall_time, entry)
+                self.queue.task_done()
+            
+            if time.monotonic() - last_flush >= _FLUSH_INTERVAL:
+                self._flush_files()
+                last_flush = time.monotonic()
+        
+        for f in self.files.values():
+            f.close()
+        for sink in self.sinks:
+            sink.close()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = _LogWriter()
+                _writer.start()
+    return _writer
+
+
+def flush():
+    """Block until everything logged so far has been written to disk."""
+    if _writer is None or not _writer.is_alive():
+        return
+    _writer.queue.put((None, None, "flush"))
+    _writer.queue.join()
 
 
-def log_state():
-    global _frame_count, _state_log_initialized
-
-    # Stop logging after `_MAX_SECONDS` seconds
-    if _frame_count > _FPS * _MAX_SECONDS:
+def shutdown():
+    """Write out pending entries and stop the writer thread."""
+    global _writer
+    if _writer is None:
         return
+    if _writer.is_alive():
+        _writer.queue.put((None, None, "stop"))
+        _writer.join()
+    _writer = None
 
-    # Take a snapshot approx. once per second
-    _frame_count += 1
-    if _frame_count % _FPS != 0:
-        return
 
-    now = datetime.now()
+def get_dropped_count():
+    """Number of entries discarded because the queue was full."""
+    return _writer.dropped if _writer else 0
 
-    frame = inspect.currentframe()
-    if frame is None:
-        return
 
-    frame_back = frame.f_back
-    if frame_back is None:
-        return
+atexit.register(shutdown)
 
-    local_vars = frame_back.f_locals.copy()
 
-    screen_size = []
-    game_state = {}
+def register_group(name, group):
+    """Include every sprite in `group` in state snapshots under `name`."""
+    _groups[name] = group
 
-    for key, value in local_vars.items():
-        if "pygame" in str(type(value)) and hasattr(value, "get_size"):
-            screen_size = value.get_size()
 
-        if hasattr(value, "__class__") and "Group" in value.__class__.__name__:
-            sprites_data = []
+def register_entity(name, entity):
+    """Include a single sprite (e.g. the player) in state snapshots under `name`."""
+    _entities[name] = entity
 
-            for i, sprite in enumerate(value):
-                if i >= _SPRITE_SAMPLE_LIMIT:
-                    break
 
-                sprite_info = {"type": sprite.__class__.__name__}
+def register_screen(screen):
+    """Record the display size in state snapshots."""
+    global _screen_size
+    _screen_size = list(screen.get_size())
+
+
+def clear_registry():
+    """Forget all registered groups and entities, e.g. when a new game starts."""
+    _groups.clear()
+    _entities.clear()
+
 
-                if hasattr(sprite, "position"):
-                    sprite_info["pos"] = [
-                        round(sprite.position.x, 2),
-                        round(sprite.position.y, 2),
-                    ]
+def configure_state_log(interval_frames=_FPS, sample_limit=None):
+    """Snapshot every `interval_frames` calls to log_state().
+    
+    sample_limit caps the sprites recorded per group; None records all of them.
+    """
+    global _state_interval, _sample_limit
+    _state_interval = max(1, interval_frames)
+    _sample_limit = sample_limit
 
-                if hasattr(sprite, "velocity"):
-                    sprite_info["vel"] = [
-                        round(sprite.velocity.x, 2),
-                        round(sprite.velocity.y, 2),
-                    ]
 
-                if hasattr(sprite, "radius"):
-                    sprite_info["rad"] = sprite.radius
+def configure_event_log(enabled=True):
+    """Turn game_events.jsonl on or off, e.g. for batch simulations that only want results."""
+    global _events_enabled
+    _events_enabled = enabled
 
-                if hasattr(sprite, "rotation"):
-                    sprite_info["rot"] = round(sprite.rotation, 2)
 
-                sprites_data.append(sprite_info)
+def set_state_sink(sink):
+    """Send snapshots to `sink` as columns instead of writing game_state.jsonl.
+    
+    The sink needs write(columns), flush() and close(); they are called from
+    the writer thread (see snapshot_store.ColumnarSnapshotWriter). Pass None
+    to go back to the JSON log.
+    """
+    global _state_sink
+    _state_sink = sink
 
-            game_state[key] = {"count": len(value), "sprites": sprites_data}
 
-        if len(game_state) == 0 and hasattr(value, "position"):
-            sprite_info = {"type": value.__class__.__name__}
+def set_frame(frame):
+    """Stamp events logged from now on with this world frame (World.step calls it every step)."""
+    global _event_frame
+    _event_frame = frame
 
-            sprite_info["pos"] = [
-                round(value.position.x, 2),
-                round(value.position.y, 2),
-            ]
 
-            if hasattr(value, "velocity"):
-                sprite_info["vel"] = [
-                    round(value.velocity.x, 2),
-                    round(value.velocity.y, 2),
-                ]
+def _sprite_info(sprite):
+    sprite_info = {"type": sprite.__class__.__name__}
 
-            if hasattr(value, "radius"):
-                sprite_info["rad"] = value.radius
+    position = getattr(sprite, "position", None)
+    if position is not None:
+        sprite_info["pos"] = [round(position.x, 2), round(position.y, 2)]
 
-            if hasattr(value, "rotation"):
-                sprite_info["rot"] = round(value.rotation, 2)
+    velocity = getattr(sprite, "velocity", None)
+    if velocity is not None:
+        sprite_info["vel"] = [round(velocity.x, 2), round(velocity.y, 2)]
 
-            game_state[key] = sprite_info
+    radius = getattr(sprite, "radius", None)
+    if radius is not None:
+        sprite_info["rad"] = radius
+
+    rotation = getattr(sprite, "rotation", None)
+    if rotation is not None:
+        sprite_info["rot"] = round(rotation, 2)
+
+    return sprite_info
+
+
+def log_state():
+    """Count a frame and, every configured interval, snapshot the registered world."""
+    global _frame_count
+
+    _frame_count += 1
+    if _frame_count % _state_interval != 0:
+        return
+
+    now = time.time()
+    if _state_sink is not None:
+        sprites = list(_entities.values())
+        for group in _groups.values():
+            group_sprites = group.sprites()
+            if _sample_limit is not None:
+                group_sprites = group_sprites[:_sample_limit]
+            sprites.extend(group_sprites)
+        _get_writer().submit(_state_sink, now, build_columns(_frame_count, sprites))
+        return
+
+    game_state = {}
+
+    for name, group in _groups.items():
+        sprites = group.sprites()
+        if _sample_limit is not None:
+            sprites = sprites[:_sample_limit]
+        game_state[name] = {
+            "count": len(group),
+            "sprites": [_sprite_info(sprite) for sprite in sprites],
+        }
+
+    for name, entity in _entities.items():
+        game_state[name] = _sprite_info(entity)
 
     entry = {
-        "timestamp": now.strftime("%H:%M:%S.%f")[:-3],
-        "elapsed_s": math.floor((now - _start_time).total_seconds()),
         "frame": _frame_count,
-        "screen_size": screen_size,
+        "screen_size": _screen_size,
         **game_state,
     }
 
-    # New log file on each run
-    mode = "w" if not _state_log_initialized else "a"
-    with open("game_state.jsonl", mode) as f:
-        f.write(json.dumps(entry) + "\n")
-
-    _state_log_initialized = True
+    _get_writer().submit(_STATE_LOG, now, entry)
 
 
 def log_event(event_type, **details):
-    global _event_log_initialized
-
-    # Stop logging after `_MAX_SECONDS` seconds
-    if _frame_count > _FPS * _MAX_SECONDS:
+    if not _events_enabled:
         return
-
-    now = datetime.now()
-
     event = {
-        "timestamp": now.strftime("%H:%M:%S.%f")[:-3],
-        "elapsed_s": math.floor((now - _start_time).total_seconds()),
-        "frame": _frame_count,
+        "frame": _event_frame,
         "type": event_type,
         **details,
     }
 
-    mode = "w" if not _event_log_initialized else "a"
-    with open("game_events.jsonl", mode) as f:
-        f.write(json.dumps(event) + "\n")
-
-    _event_log_initialized = True
\ No newline at end of file
+    _get_writer().submit(_EVENT_LOG, time.time(), event)
\ No newline at end of file
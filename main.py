@@ -1,300 +1,183 @@
+import os
 import random
+import time
 import pygame
-from player import Player
-from logger import log_event, log_state
-from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, ASTEROID_MIN_RADIUS, 
-                       SCORE_SMALL_ASTEROID, SCORE_MEDIUM_ASTEROID, SCORE_LARGE_ASTEROID, 
-                       PLAYER_LIVES, PLAYER_WARP_TIME_SCALE, POWERUP_SPAWN_CHANCE, 
-                       SHIELD_SPAWN_WEIGHT, SPEED_SPAWN_WEIGHT,
-                       SHAKE_HIT_INTENSITY, SHAKE_WARP_INTENSITY, SHAKE_EXPLOSION_INTENSITY,
-                       WEAPON_PICKUP_SPAWN_CHANCE, ROCKET_SPAWN_WEIGHT, MINE_SPAWN_WEIGHT)
-from asteroid import Asteroid
-from asteroidfield import AsteroidField
-from shot import Shot
-from explosion import AsteroidExplosion, ShipExplosion, ShieldExplosion
+import profiler
+from logger import log_state, log_event, register_screen, set_state_sink
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, ASTEROID_ATLAS_ENABLED,
+                       STATE_LOG_COLUMNAR, STATE_LOG_COLUMNAR_DIR, DIRTY_RECT_PRESENTATION,
+                       PROFILER_TRACE_FILE, INPUT_RECORDING, INPUT_RECORDING_DIR,
+                       REPLAY_ARCHIVE, REPLAY_KEYFRAME_SECONDS)
 from ui import UI, STATE_MENU, STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER
-from shield_powerup import ShieldPowerUp
-from speed_powerup import SpeedPowerUp
 from starfield import Starfield
-from screen_shake import ScreenShake
-from rocket import Rocket, RocketExplosion
-from mine import Mine, MineExplosion
-from rocket_pickup import RocketPickup
-from mine_pickup import MinePickup
+from player_input import PlayerInput
+from world import World
+from asteroid import Asteroid
+from asteroid_atlas import AsteroidAtlas
+from snapshot_store import ColumnarSnapshotWriter
+from presenter import DirtyRectPresenter
+from input_recording import InputRecorder
+from replay_archive import ReplayWriter
 
 
 def init_game():
-    updatable = pygame.sprite.Group()
-    drawable = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    shots = pygame.sprite.Group()
-    powerups = pygame.sprite.Group()
-    rockets = pygame.sprite.Group()
-    mines = pygame.sprite.Group()
-    
-    Asteroid.containers = (asteroids, updatable, drawable)
-    Asteroid.asteroids_group = asteroids
-    AsteroidField.containers = (updatable,)
-    AsteroidField.asteroids_group = asteroids
-    AsteroidField()
-    Shot.containers = (shots, updatable, drawable)
-    AsteroidExplosion.containers = (updatable, drawable)
-    ShipExplosion.containers = (updatable, drawable)
-    ShieldExplosion.containers = (updatable, drawable)
-    RocketExplosion.containers = (updatable, drawable)
-    MineExplosion.containers = (updatable, drawable)
-    ShieldPowerUp.containers = (powerups, updatable, drawable)
-    SpeedPowerUp.containers = (powerups, updatable, drawable)
-    RocketPickup.containers = (powerups, updatable, drawable)
-    MinePickup.containers = (powerups, updatable, drawable)
-    Rocket.containers = (rockets, updatable, drawable)
-    Rocket.asteroids_group = asteroids
-    Rocket.taken_targets = set()  # Track which asteroids are already targeted
-    Mine.containers = (mines, updatable, drawable)
-    Player.containers = (updatable, drawable)
-    player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-    # Note: player.position is a Vector2, which is mutable and shared by reference
-    Rocket.player_ref = player  # Rockets target asteroids nearest to player
-    
+    seed = random.getrandbits(63)  # Known, so the game can be recorded and replayed
+    world = World(seed)
     starfield = Starfield()
-    screen_shake = ScreenShake()
-    
-    return updatable, drawable, asteroids, shots, powerups, rockets, mines, player, starfield, screen_shake
+    recorder = None
+    name = os.path.join(INPUT_RECORDING_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{seed}")
+    if REPLAY_ARCHIVE:
+        recorder = ReplayWriter(name + ".pyrp", seed, world, REPLAY_KEYFRAME_SECONDS)
+    elif INPUT_RECORDING:
+        recorder = InputRecorder(name + ".pyin", seed)
+    return world, starfield, recorder
 
 
 def main():
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Pyasteroids")
+    register_screen(screen)
     clock = pygame.time.Clock()
+    if ASTEROID_ATLAS_ENABLED:
+        Asteroid.atlas = AsteroidAtlas()
+    if STATE_LOG_COLUMNAR:
+        set_state_sink(ColumnarSnapshotWriter(STATE_LOG_COLUMNAR_DIR))
+    
+    presenter = DirtyRectPresenter(screen) if DIRTY_RECT_PRESENTATION else None
     
     ui = UI()
     game_state = STATE_MENU
-    score = 0
-    lives = PLAYER_LIVES
-    updatable, drawable, asteroids, shots, powerups, rockets, mines, player = None, None, None, None, None, None, None, None
-    starfield, screen_shake = None, None
+    presented_state = None
+    world, starfield, recorder = None, None, None
     dt = 0
     running = True
 
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            if event.type == pygame.KEYDOWN:
-                if game_state == STATE_MENU:
-                    if event.key == pygame.K_SPACE:
-                        game_state = STATE_PLAYING
-                        score = 0
-                        lives = PLAYER_LIVES
-                        updatable, drawable, asteroids, shots, powerups, rockets, mines, player, starfield, screen_shake = init_game()
-                    elif event.key == pygame.K_ESCAPE:
-                        running = False
-                elif game_state == STATE_PLAYING:
-                    if event.key == pygame.K_ESCAPE:
-                        game_state = STATE_PAUSED
-                    elif event.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
-                        player.start_warp_charge()
-                elif game_state == STATE_PAUSED:
-                    if event.key == pygame.K_SPACE:
-                        game_state = STATE_PLAYING
-                    elif event.key == pygame.K_ESCAPE:
-                        game_state = STATE_MENU
-                        ui.reset_menu_asteroids()
-                elif game_state == STATE_GAME_OVER:
-                    if event.key == pygame.K_SPACE:
-                        game_state = STATE_PLAYING
-                        score = 0
-                        lives = PLAYER_LIVES
-                        updatable, drawable, asteroids, shots, powerups, rockets, mines, player, starfield, screen_shake = init_game()
-                    elif event.key == pygame.K_ESCAPE:
-                        game_state = STATE_MENU
-                        ui.reset_menu_asteroids()
-            if event.type == pygame.KEYUP:
-                if game_state == STATE_PLAYING and player:
-                    if event.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
-                        player.release_warp()
+        with profiler.phase("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                if event.type == pygame.KEYDOWN:
+                    # Profiler keys work in every state
+                    if event.key == pygame.K_F3:
+                        profiler.set_enabled(not profiler.is_enabled())
+                        if presenter:
+                            presenter.invalidate()
+                    elif event.key == pygame.K_F4:
+                        log_event("profiler_trace", path=PROFILER_TRACE_FILE,
+                                  events=profiler.export_trace(PROFILER_TRACE_FILE))
+                    elif game_state == STATE_MENU:
+                        if event.key == pygame.K_SPACE:
+                            game_state = STATE_PLAYING
+                            world, starfield, recorder = init_game()
+                        elif event.key == pygame.K_ESCAPE:
+                            running = False
+                    elif game_state == STATE_PLAYING:
+                        if event.key == pygame.K_ESCAPE:
+                            game_state = STATE_PAUSED
+                    elif game_state == STATE_PAUSED:
+                        if event.key == pygame.K_SPACE:
+                            game_state = STATE_PLAYING
+                        elif event.key == pygame.K_ESCAPE:
+                            game_state = STATE_MENU
+                            ui.reset_menu_asteroids()
+                            if recorder:
+                                recorder.close()  # Game abandoned
+                    elif game_state == STATE_GAME_OVER:
+                        if event.key == pygame.K_SPACE:
+                            game_state = STATE_PLAYING
+                            world, starfield, recorder = init_game()
+                        elif event.key == pygame.K_ESCAPE:
+                            game_state = STATE_MENU
+                            ui.reset_menu_asteroids()
 
+        dirty_rects = []
+        
         if game_state == STATE_MENU:
             ui.draw_menu(screen, dt)
+            if presenter:
+                dirty_rects = ui.get_menu_rects()
         
         elif game_state == STATE_PAUSED:
-            ui.draw_paused(screen, drawable)
+            ui.draw_paused(screen, world.drawable)
         
         elif game_state == STATE_GAME_OVER:
-            ui.draw_game_over(screen, score, dt)
+            ui.draw_game_over(screen, world.score, dt)
+            if presenter:
+                dirty_rects = ui.get_menu_rects()
         
         elif game_state == STATE_PLAYING:
-            # Apply time slowdown when charging warp
-            game_dt = dt
-            if player.is_warp_charging():
-                game_dt = dt * PLAYER_WARP_TIME_SCALE
+            # All gameplay happens in the world; this loop only feeds input and draws
+            inputs = PlayerInput.from_keys(pygame.key.get_pressed())
+            if recorder:
+                recorder.record(inputs, dt)
+            with profiler.phase("world.step"):
+                world.step(dt, inputs)
+            if world.game_over:
+                game_state = STATE_GAME_OVER
+                if recorder:
+                    recorder.close()
             
-            # Update warp charge timer (uses real time, not slowed time)
-            warp_executed = player.update_warp_charge(dt)
-            if warp_executed:
-                screen_shake.add_shake(SHAKE_WARP_INTENSITY)
+            player = world.player
+            screen_shake = world.screen_shake
             
             # Update screen shake
             screen_shake.update(dt)
             
-            # Update starfield with player velocity for parallax
-            starfield.update(dt, player.velocity)
-            
-            screen.fill('black')
+            with profiler.phase("starfield"):
+                # Update starfield with player velocity for parallax
+                starfield.update(dt, player.velocity)
+                
+                screen.fill('black')
+                
+                # Draw starfield first (background)
+                starfield.draw(screen)
             
-            # Draw starfield first (background)
-            starfield.draw(screen)
+            with profiler.phase("draw"):
+                for drawable_sprite in world.drawable:
+                    drawable_sprite.draw(screen)
             
-            # Apply screen shake offset
-            shake_offset = screen_shake.get_offset()
+            # Shift the finished scene by the shake offset (starfield included)
             if screen_shake.is_shaking():
-                shake_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                shake_surface.fill('black')
-                starfield.draw(shake_surface)
-                for drawable_sprite in drawable:
-                    drawable_sprite.draw(shake_surface)
-                screen.blit(shake_surface, shake_offset)
-            else:
-                for drawable_sprite in drawable:
-                    drawable_sprite.draw(screen)
+                screen_shake.apply(screen)
+                if presenter:
+                    presenter.invalidate()
             
             # HUD always drawn without shake
-            ui.draw_hud(screen, score, lives, player.get_warp_cooldown(), 
-                       player.is_warp_charging(), player.get_warp_charge_remaining(),
-                       player.has_active_shield(), player.get_speed_boost_remaining(),
-                       player.get_rocket_ammo(), player.get_mine_ammo())
+            with profiler.phase("hud"):
+                ui.draw_hud(screen, world.score, world.lives, player.get_warp_cooldown(), 
+                           player.is_warp_charging(), player.get_warp_charge_remaining(),
+                           player.has_active_shield(), player.get_speed_boost_remaining(),
+                           player.get_rocket_ammo(), player.get_mine_ammo())
 
-            log_state()  # Log the current state of the game
-            
-            updatable.update(game_dt)
-            
-            # Clear fired projectiles list (they auto-add via containers)
-            player.get_fired_projectiles()
-            
-            # Check asteroid-asteroid collisions
-            asteroid_list = list(asteroids)
-            collided = set()  # Track asteroids that already collided this frame
-            for i, asteroid1 in enumerate(asteroid_list):
-                if asteroid1 in collided:
-                    continue
-                for asteroid2 in asteroid_list[i + 1:]:
-                    if asteroid2 in collided:
-                        continue
-                    if asteroid1.collides_with(asteroid2):
-                        log_event("asteroid_collision")
-                        AsteroidExplosion(asteroid1.position.x, asteroid1.position.y, asteroid1.radius)
-                        AsteroidExplosion(asteroid2.position.x, asteroid2.position.y, asteroid2.radius)
-                        screen_shake.add_shake(SHAKE_EXPLOSION_INTENSITY)
-                        collided.add(asteroid1)
-                        collided.add(asteroid2)
-                        asteroid1.split()
-                        asteroid2.split()
-                        break
-            
-            for asteroid in asteroids:
-                if player.collides_with_circle(asteroid) and not player.is_invincible():
-                    log_event("player_hit")
-                    # Check if player has shield
-                    if player.break_shield():
-                        # Shield absorbs the hit
-                        log_event("shield_break")
-                        ShieldExplosion(player.position.x, player.position.y)
-                        screen_shake.add_shake(SHAKE_HIT_INTENSITY)
-                        # Still push player away
-                        knockback_dir = (player.position - asteroid.position).normalize()
-                        player.take_hit(knockback_dir)
-                    else:
-                        # No shield - take damage
-                        ShipExplosion(player.position.x, player.position.y)
-                        screen_shake.add_shake(SHAKE_HIT_INTENSITY * 2)
-                        lives -= 1
-                        if lives <= 0:
-                            game_state = STATE_GAME_OVER
-                        else:
-                            # Push player away from asteroid
-                            knockback_dir = (player.position - asteroid.position).normalize()
-                            player.take_hit(knockback_dir)
-                    break
-                for shot in shots:
-                    if asteroid.collides_with(shot):
-                        log_event("asteroid_shot")
-                        AsteroidExplosion(asteroid.position.x, asteroid.position.y, asteroid.radius)
-                        screen_shake.add_shake(SHAKE_EXPLOSION_INTENSITY * (asteroid.radius / ASTEROID_MIN_RADIUS) * 0.5)
-                        # Award points based on asteroid size
-                        if asteroid.radius <= ASTEROID_MIN_RADIUS:
-                            score += SCORE_SMALL_ASTEROID
-                        elif asteroid.radius <= ASTEROID_MIN_RADIUS * 2:
-                            score += SCORE_MEDIUM_ASTEROID
-                        else:
-                            score += SCORE_LARGE_ASTEROID
-                        
-                        # Chance to spawn power-up (only on player kills)
-                        if random.random() < POWERUP_SPAWN_CHANCE:
-                            # Weighted random selection for power-up type
-                            powerup_classes = [ShieldPowerUp, SpeedPowerUp]
-                            weights = [SHIELD_SPAWN_WEIGHT, SPEED_SPAWN_WEIGHT]
-                            PowerUpClass = random.choices(powerup_classes, weights=weights)[0]
-                            PowerUpClass(asteroid.position.x, asteroid.position.y)
-                            log_event("powerup_spawn")
-                        
-                        # Chance to spawn weapon pickup
-                        if random.random() < WEAPON_PICKUP_SPAWN_CHANCE:
-                            weapon_classes = [RocketPickup, MinePickup]
-                            weights = [ROCKET_SPAWN_WEIGHT, MINE_SPAWN_WEIGHT]
-                            WeaponClass = random.choices(weapon_classes, weights=weights)[0]
-                            WeaponClass(asteroid.position.x, asteroid.position.y)
-                            log_event("weapon_pickup_spawn")
-                        
-                        shot.kill()
-                        asteroid.split()
+            with profiler.phase("log_state"):
+                log_state()  # Log the current state of the game
             
-            # Check rocket collisions with asteroids
-            for rocket in list(rockets):
-                for asteroid in list(asteroids):
-                    if rocket.collides_with(asteroid):
-                        log_event("rocket_hit")
-                        RocketExplosion(rocket.position.x, rocket.position.y)
-                        screen_shake.add_shake(SHAKE_EXPLOSION_INTENSITY * 2)
-                        
-                        # Destroy hit asteroid
-                        AsteroidExplosion(asteroid.position.x, asteroid.position.y, asteroid.radius)
-                        score += SCORE_MEDIUM_ASTEROID
-                        asteroid.split()
-                        rocket.kill()
-                        break
-            
-            # Check mine collisions with asteroids
-            for mine in list(mines):
-                if not mine.is_armed():
-                    continue
-                for asteroid in list(asteroids):
-                    if mine.collides_with(asteroid):
-                        log_event("mine_explode")
-                        explosion_radius = mine.get_explosion_radius()
-                        MineExplosion(mine.position.x, mine.position.y, explosion_radius)
-                        screen_shake.add_shake(SHAKE_EXPLOSION_INTENSITY * 4)
-                        
-                        # Destroy all asteroids in explosion radius
-                        for other_asteroid in list(asteroids):
-                            if mine.position.distance_to(other_asteroid.position) < explosion_radius + other_asteroid.radius:
-                                AsteroidExplosion(other_asteroid.position.x, other_asteroid.position.y, other_asteroid.radius)
-                                score += SCORE_MEDIUM_ASTEROID
-                                other_asteroid.split()
-                        
-                        mine.kill()
-                        break
-            
-            # Check power-up collection
-            for powerup in powerups:
-                if player.collides_with(powerup):
-                    log_event("powerup_collect", type=powerup.get_name())
-                    powerup.apply(player)
-                    powerup.kill()
+            if presenter:
+                dirty_rects = starfield.get_draw_rects() + ui.get_hud_rects()
+                for drawable_sprite in world.drawable:
+                    dirty_rects.extend(drawable_sprite.get_draw_rects())
 
-        pygame.display.flip()
-        dt = clock.tick(60) / 1000  # Limit to 60 FPS
+        if profiler.is_enabled():
+            ui.draw_profiler(screen)
+            dirty_rects.append(ui.get_profiler_rect())
+
+        with profiler.phase("present"):
+            if presenter:
+                # Screens change completely between states
+                if game_state != presented_state:
+                    presenter.invalidate()
+                    presented_state = game_state
+                presenter.present(dirty_rects)
+            else:
+                pygame.display.flip()
+        with profiler.phase("tick"):
+            dt = clock.tick(60) / 1000  # Limit to 60 FPS
+        profiler.end_frame()
 
+    if recorder:
+        recorder.close()
     pygame.quit()
 
 
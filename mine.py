@@ -1,17 +1,18 @@
 import math
-import random
 import pygame
-from circleshape import CircleShape
+import rng
+from circleshape import CircleShape, circle_rect
 from constants import (MINE_DRIFT_SPEED, MINE_LIFETIME, MINE_RADIUS, 
                        MINE_EXPLOSION_RADIUS, MINE_ARM_TIME)
-from particle import Particle
 from particle_effect import ParticleEffect
+from sprite_cache import get_glow, get_ring
 
 
 class Mine(CircleShape):
     """Drifting mine that explodes on contact with asteroids."""
     
     containers = None  # Set by main.py
+    collision_layer = "mine"
     
     def __init__(self, x, y, initial_velocity):
         super().__init__(x, y, MINE_RADIUS)
@@ -21,7 +22,7 @@ class Mine(CircleShape):
         self.spike_rotation = 0.0
         
         # Inherit some player velocity + random drift
-        drift_angle = random.uniform(0, 360)
+        drift_angle = rng.gameplay.uniform(0, 360)
         drift = pygame.Vector2(1, 0).rotate(drift_angle) * MINE_DRIFT_SPEED
         self.velocity = initial_velocity * 0.2 + drift
     
@@ -33,6 +34,12 @@ class Mine(CircleShape):
         """Get the area of effect radius."""
         return MINE_EXPLOSION_RADIUS
     
+    def get_state(self):
+        return (self.lifetime, self.arm_timer, self.pulse_timer, self.spike_rotation)
+    
+    def set_state(self, state):
+        self.lifetime, self.arm_timer, self.pulse_timer, self.spike_rotation = state[:4]
+    
     def update(self, dt):
         self.lifetime -= dt
         if self.lifetime <= 0:
@@ -98,15 +105,11 @@ class Mine(CircleShape):
                 pygame.draw.line(screen, aoe_color, start_pos, end_pos, 1)
         
         # Draw glow
-        glow_radius = int(self.radius * 1.5 * pulse)
-        glow_surface = pygame.Surface((glow_radius * 4, glow_radius * 4), pygame.SRCALPHA)
-        for i in range(glow_radius, 0, -2):
-            alpha = int(40 * (1 - i / glow_radius))
-            pygame.draw.circle(glow_surface, (*glow_color, alpha), 
-                             (glow_radius * 2, glow_radius * 2), i)
-        screen.blit(glow_surface, 
-                   (int(self.position.x - glow_radius * 2), 
-                    int(self.position.y - glow_radius * 2)), 
+        glow = get_glow(self.radius * 1.5 * pulse, glow_color, 40)
+        glow_radius = glow.get_width() // 2
+        screen.blit(glow, 
+                   (int(self.position.x - glow_radius), 
+                    int(self.position.y - glow_radius)), 
                    special_flags=pygame.BLEND_ADD)
         
         # Draw spikes (6 spikes rotating)
@@ -131,6 +134,11 @@ class Mine(CircleShape):
                           (int(self.position.x), int(self.position.y)), 
                           max(2, draw_radius // 2))
 
+    def get_draw_rects(self):
+        # Spikes (with their tips) reach furthest unless the AOE ring is showing
+        reach = MINE_EXPLOSION_RADIUS + 1 if self.is_armed() else self.radius * 1.8 + 3
+        return [circle_rect(self.position.x, self.position.y, reach)]
+
 
 class MineExplosion(ParticleEffect):
     """Large area explosion effect when mine detonates."""
@@ -148,35 +156,36 @@ class MineExplosion(ParticleEffect):
     def _create_burst(self, x, y, radius):
         """Create ring of particles expanding outward."""
         # Core burst
+        speeds, angles, lifetimes, sizes, colors = [], [], [], [], []
         for _ in range(40):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(100, 300)
-            lifetime = random.uniform(0.4, 0.8)
-            color = random.choice(self.EXPLOSION_COLORS)
-            size = random.uniform(3, 7)
-            
-            particle = Particle.create_radial(x, y, color, speed, angle, lifetime, size)
-            self._add_particle(particle)
+            angles.append(rng.cosmetic.uniform(0, 2 * math.pi))
+            speeds.append(rng.cosmetic.uniform(100, 300))
+            lifetimes.append(rng.cosmetic.uniform(0.4, 0.8))
+            colors.append(rng.cosmetic.choice(self.EXPLOSION_COLORS))
+            sizes.append(rng.cosmetic.uniform(3, 7))
+        
+        self._emit_radial(x, y, speeds, angles, lifetimes, sizes, colors)
         
         # Ring particles at explosion edge
         ring_particles = 24
+        xs, ys, speeds, angles, lifetimes, sizes, colors = [], [], [], [], [], [], []
         for i in range(ring_particles):
             angle = (2 * math.pi * i) / ring_particles
-            px = x + math.cos(angle) * radius * 0.8
-            py = y + math.sin(angle) * radius * 0.8
+            xs.append(x + math.cos(angle) * radius * 0.8)
+            ys.append(y + math.sin(angle) * radius * 0.8)
+            angles.append(angle)
             
-            speed = random.uniform(50, 150)
-            lifetime = random.uniform(0.3, 0.6)
-            color = random.choice(self.EXPLOSION_COLORS)
-            size = random.uniform(2, 5)
-            
-            particle = Particle.create_radial(px, py, color, speed, angle, lifetime, size)
-            self._add_particle(particle)
+            speeds.append(rng.cosmetic.uniform(50, 150))
+            lifetimes.append(rng.cosmetic.uniform(0.3, 0.6))
+            colors.append(rng.cosmetic.choice(self.EXPLOSION_COLORS))
+            sizes.append(rng.cosmetic.uniform(2, 5))
+        
+        self._emit_radial(xs, ys, speeds, angles, lifetimes, sizes, colors)
     
     def update(self, dt):
         super().update(dt)
         self.expansion_timer += dt
-        if len(self.particles) == 0:
+        if not self.has_particles():
             self.kill()
     
     def draw(self, screen):
@@ -187,12 +196,14 @@ class MineExplosion(ParticleEffect):
             alpha = int(150 * (1 - progress))
             
             # Draw ring
-            ring_surface = pygame.Surface((ring_radius * 2 + 4, ring_radius * 2 + 4), pygame.SRCALPHA)
-            pygame.draw.circle(ring_surface, (255, 100, 100, alpha), 
-                             (ring_radius + 2, ring_radius + 2), ring_radius, 3)
+            ring_surface = get_ring(ring_radius, (255, 100, 100), alpha, 3)
+            half_size = ring_surface.get_width() // 2
             screen.blit(ring_surface, 
-                       (int(self.center.x - ring_radius - 2), 
-                        int(self.center.y - ring_radius - 2)))
-        
-        # Draw particles
-        super().draw(screen)
+                       (int(self.center.x - half_size), 
+                        int(self.center.y - half_size)))
+
+    def get_draw_rects(self):
+        if self.expansion_timer >= self.expansion_duration:
+            return []
+        ring_radius = self.max_radius * self.expansion_timer / self.expansion_duration
+        return [circle_rect(self.center.x, self.center.y, ring_radius + 4)]
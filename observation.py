@@ -0,0 +1,121 @@
+import math
+import numpy as np
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_MAX_SPEED, PLAYER_LIVES, ASTEROID_MAX_RADIUS,
+                       PLAYER_WARP_COOLDOWN_SECONDS, PLAYER_WARP_MAX_CHARGE_SECONDS,
+                       SPEED_BOOST_DURATION, ROCKET_MAX_AMMO, MINE_MAX_AMMO)
+
+PICKUP_KINDS = ("Shield", "Speed", "Rocket", "Mine")  # get_name() values, one-hot in that order
+
+# Feature layouts; asteroid, shot and pickup slots start with a 1/0 "present" flag
+PLAYER_FEATURES = ("x", "y", "vx", "vy", "sin_rotation", "cos_rotation", "lives", "invincible",
+                   "shield", "speed_boost", "warp_cooldown", "warp_charging", "warp_charge",
+                   "rockets", "mines")
+ASTEROID_FEATURES = ("present", "dx", "dy", "vx", "vy", "radius")
+SHOT_FEATURES = ("present", "dx", "dy", "vx", "vy")
+PICKUP_FEATURES = ("present", "dx", "dy") + PICKUP_KINDS
+
+_SCREEN = np.array([SCREEN_WIDTH, SCREEN_HEIGHT])
+_ENTITY_SECTIONS = ("asteroids", "shots", "pickups")
+
+
+class ObservationEncoder:
+    """Fixed-size float32 observation of a world, built with NumPy.
+
+    The vector holds the player's kinematics and status, then the nearest
+    asteroids, shots and pickups (nearest first, empty slots zeroed), then
+    optionally a grid_size x grid_size asteroid occupancy grid. Offsets are
+    measured the short way round the wrapping screen and scaled by the
+    screen size; speeds are scaled by PLAYER_MAX_SPEED. `slices` names each
+    section of the vector.
+    """
+
+    def __init__(self, asteroids=8, shots=8, pickups=4, grid_size=None):
+        self.counts = {"asteroids": asteroids, "shots": shots, "pickups": pickups}
+        self.grid_size = grid_size
+        self.slices = {}
+        offset = 0
+        sections = [("player", len(PLAYER_FEATURES)),
+                    ("asteroids", asteroids * len(ASTEROID_FEATURES)),
+                    ("shots", shots * len(SHOT_FEATURES)),
+                    ("pickups", pickups * len(PICKUP_FEATURES))]
+        if grid_size:
+            sections.append(("grid", grid_size * grid_size))
+            # Cell centre coordinates and half sizes along each axis
+            centers = (np.arange(grid_size) + 0.5) / grid_size
+            self.cell_columns = (centers * SCREEN_WIDTH)[:, None]
+            self.cell_rows = (centers * SCREEN_HEIGHT)[:, None]
+            self.half_cell = np.array([SCREEN_WIDTH, SCREEN_HEIGHT]) / (2 * grid_size)
+        for name, size in sections:
+            self.slices[name] = slice(offset, offset + size)
+            offset += size
+        self.size = offset
+
+    def encode(self, world, out=None):
+        """Observation of `world`, written into `out` (a float32 array of self.size) if given."""
+        if out is None:
+            out = np.empty(self.size, dtype=np.float32)
+        out[:] = 0
+        player = world.player
+        origin = np.array([player.position.x, player.position.y])
+
+        rotation = math.radians(player.rotation)
+        out[self.slices["player"]] = (
+            player.position.x / SCREEN_WIDTH, player.position.y / SCREEN_HEIGHT,
+            player.velocity.x / PLAYER_MAX_SPEED, player.velocity.y / PLAYER_MAX_SPEED,
+            math.sin(rotation), math.cos(rotation), world.lives / PLAYER_LIVES,
+            player.is_invincible(), player.has_active_shield(),
+            player.get_speed_boost_remaining() / SPEED_BOOST_DURATION,
+            player.get_warp_cooldown() / PLAYER_WARP_COOLDOWN_SECONDS, player.is_warp_charging(),
+            player.get_warp_charge_remaining() / PLAYER_WARP_MAX_CHARGE_SECONDS,
+            player.get_rocket_ammo() / ROCKET_MAX_AMMO, player.get_mine_ammo() / MINE_MAX_AMMO,
+        )
+
+        # One row per entity: section, x, y, vx, vy, then radius (asteroids) or kind (pickups)
+        rows = [(0, a.position.x, a.position.y, a.velocity.x, a.velocity.y, a.radius) for a in world.asteroids]
+        rows += [(1, s.position.x, s.position.y, s.velocity.x, s.velocity.y, 0) for s in world.shots]
+        rows += [(2, p.position.x, p.position.y, 0, 0, PICKUP_KINDS.index(p.get_name())) for p in world.powerups]
+        if not rows:
+            return out
+        rows = np.array(rows, dtype=float)
+        offsets = self._wrap(rows[:, 1:3] - origin)
+        distances = (offsets * offsets).sum(axis=1)
+        # Sorted by section, nearest first within each; bounds[i]:bounds[i + 1] is section i
+        order = np.lexsort((distances, rows[:, 0]))
+        bounds = np.searchsorted(rows[order, 0], (0, 1, 2, 3))
+        offsets /= _SCREEN
+
+        for index, name in enumerate(_ENTITY_SECTIONS):
+            count = self.counts[name]
+            chosen = order[bounds[index]:min(bounds[index + 1], bounds[index] + count)]
+            if not len(chosen):
+                continue
+            section = out[self.slices[name]].reshape(count, -1)
+            used = len(chosen)
+            section[:used, 0] = 1
+            section[:used, 1:3] = offsets[chosen]
+            if name == "pickups":
+                section[np.arange(used), 3 + rows[chosen, 5].astype(int)] = 1
+            else:
+                section[:used, 3:5] = rows[chosen, 3:5] / PLAYER_MAX_SPEED
+                if name == "asteroids":
+                    section[:used, 5] = rows[chosen, 5] / ASTEROID_MAX_RADIUS
+
+        if self.grid_size:
+            asteroids = rows[order[bounds[0]:bounds[1]]]
+            # A cell is occupied when its rectangle overlaps an asteroid, wrapping at the edges.
+            # Per axis, the gap from the circle centre to the nearest point of the cell;
+            # squared gaps split per axis: (rows, asteroids) + (columns, asteroids).
+            dx = self.cell_columns - asteroids[:, 1]
+            dx -= SCREEN_WIDTH * np.rint(dx / SCREEN_WIDTH)
+            dx = np.maximum(np.abs(dx) - self.half_cell[0], 0)
+            dy = self.cell_rows - asteroids[:, 2]
+            dy -= SCREEN_HEIGHT * np.rint(dy / SCREEN_HEIGHT)
+            dy = np.maximum(np.abs(dy) - self.half_cell[1], 0)
+            inside = (dy * dy)[:, None, :] + (dx * dx)[None, :, :] <= asteroids[:, 5] ** 2
+            out[self.slices["grid"]] = inside.any(axis=2).ravel()
+        return out
+
+    @staticmethod
+    def _wrap(offsets):
+        """Shortest offsets on the wrapping screen."""
+        return offsets - _SCREEN * np.rint(offsets / _SCREEN)
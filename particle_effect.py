@@ -1,41 +1,54 @@
-import random
 import math
 import pygame
-from particle import Particle
+import rng
+from particle_system import PARTICLE_CIRCLE
 
 
 class ParticleEffect(pygame.sprite.Sprite):
-    """Base class for all particle-based visual effects."""
+    """Base class for all particle-based visual effects.
+    
+    Particles live in the shared ParticleSystem, which integrates and draws
+    them in one batch; an effect only emits and tracks how long its
+    particles will last.
+    """
+    
+    particle_system = None  # Set by the world
+    enabled = True  # Set by the world; when False, emitters skip all their work
     
     def __init__(self):
         if hasattr(self, "containers"):
             super().__init__(self.containers)
         else:
             super().__init__()
-        self.particles = []
+        self.time_left = 0.0  # Until the longest-lived particle emitted so far expires
 
-    def _add_particle(self, particle):
-        self.particles.append(particle)
+    def _emit_radial(self, x, y, speeds, angles, lifetimes, sizes, colors, kind=PARTICLE_CIRCLE, lengths=None):
+        """Hand a batch of particles to the particle system."""
+        if not lifetimes:
+            return
+        self.particle_system.emit_radial(x, y, speeds, angles, lifetimes, sizes, colors, kind, lengths)
+        self.time_left = max(self.time_left, max(lifetimes))
 
     def _create_radial_particles(self, x, y, color, count, speed_range, lifetime_range, size_range=None):
         """Helper to create particles radiating outward from a point."""
+        speeds, angles, lifetimes, sizes = [], [], [], []
         for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(speed_range[0], speed_range[1])
-            lifetime = random.uniform(lifetime_range[0], lifetime_range[1])
-            size = random.uniform(size_range[0], size_range[1]) if size_range else None
-            particle = Particle.create_radial(x, y, color, speed, angle, lifetime, size)
-            self._add_particle(particle)
+            angles.append(rng.cosmetic.uniform(0, 2 * math.pi))
+            speeds.append(rng.cosmetic.uniform(speed_range[0], speed_range[1]))
+            lifetimes.append(rng.cosmetic.uniform(lifetime_range[0], lifetime_range[1]))
+            sizes.append(rng.cosmetic.uniform(size_range[0], size_range[1]) if size_range else rng.cosmetic.uniform(2, 5))
+        self._emit_radial(x, y, speeds, angles, lifetimes, sizes, [color] * count)
 
-    def _cleanup_particles(self):
-        """Remove dead particles from the list."""
-        self.particles = [p for p in self.particles if p.is_alive()]
+    def has_particles(self):
+        """Check if any particle emitted by this effect is still alive."""
+        return self.time_left > 0
 
     def update(self, dt):
-        for particle in self.particles:
-            particle.update(dt)
-        self._cleanup_particles()
+        self.time_left -= dt
 
     def draw(self, screen):
-        for particle in self.particles:
-            particle.draw(screen)
+        # Particles are drawn by the particle system
+        pass
+
+    def get_draw_rects(self):
+        return []
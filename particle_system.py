@@ -0,0 +1,156 @@
+import numpy as np
+import pygame
+from constants import PARTICLE_CAPACITY, PARTICLE_DRAG, PARTICLE_FADE_COLOR
+from presenter import tile_rects
+
+PARTICLE_CIRCLE = 0
+PARTICLE_LINE = 1  # Rendered as a streak trailing behind its velocity
+
+_rgb_cache = {}
+
+
+def to_rgb(color):
+    """Resolve a pygame color name or tuple to an (r, g, b) tuple, cached."""
+    rgb = _rgb_cache.get(color)
+    if rgb is None:
+        rgb = tuple(pygame.Color(color))[:3] if isinstance(color, str) else tuple(color)[:3]
+        _rgb_cache[color] = rgb
+    return rgb
+
+
+class ParticleSystem(pygame.sprite.Sprite):
+    """Struct-of-arrays store that integrates and draws every particle in one pass.
+
+    Emitters (ParticleEffect subclasses) only append rows; there are no
+    per-particle objects. Dead rows are compacted away after each update.
+    """
+
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        if hasattr(self, "containers"):
+            super().__init__(self.containers)
+        else:
+            super().__init__()
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.positions = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.lifetimes = np.zeros(capacity)
+        self.max_lifetimes = np.ones(capacity)
+        self.sizes = np.zeros(capacity)
+        self.lengths = np.zeros(capacity)
+        self.colors = np.zeros((capacity, 3))
+        self.fade_colors = np.zeros((capacity, 3))
+        self.kinds = np.zeros(capacity, dtype=np.uint8)
+
+    def _columns(self):
+        return (self.positions, self.velocities, self.lifetimes, self.max_lifetimes, self.sizes,
+                self.lengths, self.colors, self.fade_colors, self.kinds)
+
+    def _reserve(self, extra):
+        """Grow the arrays (doubling) so `extra` more particles fit."""
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old = self._columns()
+        self._allocate(capacity)
+        for new_column, old_column in zip(self._columns(), old):
+            new_column[:self.count] = old_column[:self.count]
+
+    def emit_radial(self, x, y, speeds, angles, lifetimes, sizes, colors,
+                    kind=PARTICLE_CIRCLE, lengths=None, fade_color=PARTICLE_FADE_COLOR):
+        """Append particles moving outward at the given angles (radians).
+
+        x and y may be scalars or per-particle sequences; the other arguments
+        are per-particle sequences of equal length.
+        """
+        n = len(speeds)
+        if n == 0:
+            return
+        self._reserve(n)
+        start, end = self.count, self.count + n
+        speeds = np.asarray(speeds, dtype=float)
+        angles = np.asarray(angles, dtype=float)
+        self.positions[start:end, 0] = x
+        self.positions[start:end, 1] = y
+        self.velocities[start:end, 0] = np.cos(angles) * speeds
+        self.velocities[start:end, 1] = np.sin(angles) * speeds
+        self.lifetimes[start:end] = lifetimes
+        self.max_lifetimes[start:end] = lifetimes
+        self.sizes[start:end] = sizes
+        self.lengths[start:end] = lengths if lengths is not None else 0
+        self.colors[start:end] = [to_rgb(color) for color in colors]
+        self.fade_colors[start:end] = to_rgb(fade_color)
+        self.kinds[start:end] = kind
+        self.count = end
+
+    def update(self, dt):
+        n = self.count
+        if n == 0:
+            return
+        self.positions[:n] += self.velocities[:n] * dt
+        self.velocities[:n] *= PARTICLE_DRAG
+        self.lifetimes[:n] -= dt
+        alive = self.lifetimes[:n] > 0
+        if not alive.all():
+            self._compact(alive)
+
+    def _compact(self, alive):
+        """Keep only the rows flagged in `alive`, preserving emission order."""
+        n = self.count
+        keep = np.flatnonzero(alive)
+        for column in self._columns():
+            column[:len(keep)] = column[:n][keep]
+        self.count = len(keep)
+
+    def clear(self):
+        self.count = 0
+
+    def draw(self, screen):
+        n = self.count
+        if n == 0:
+            return
+        # Size, length and color all fade with remaining life
+        life_ratio = self.lifetimes[:n] / self.max_lifetimes[:n]
+        fade = self.fade_colors[:n]
+        colors = (fade + (self.colors[:n] - fade) * life_ratio[:, None]).astype(int)
+        position = self.positions[:n]
+        is_line = self.kinds[:n] == PARTICLE_LINE
+
+        circles = ~is_line
+        if circles.any():
+            centers = position[circles].astype(int).tolist()
+            sizes = np.maximum(1, (self.sizes[:n][circles] * life_ratio[circles]).astype(int)).tolist()
+            for center, color, size in zip(centers, colors[circles].tolist(), sizes):
+                pygame.draw.circle(screen, color, center, size)
+
+        if is_line.any():
+            ratio = life_ratio[is_line]
+            velocity = self.velocities[:n][is_line]
+            speed = np.hypot(velocity[:, 0], velocity[:, 1])
+            # Lines extend opposite to velocity (trail behind)
+            direction = np.zeros_like(velocity)
+            direction[:, 0] = 1
+            moving = speed > 0
+            direction[moving] = velocity[moving] / speed[moving, None]
+            lengths = np.maximum(2, self.lengths[:n][is_line] * ratio)
+            start = position[is_line]
+            end = start - direction * lengths[:, None]
+            thickness = np.maximum(1, (self.sizes[:n][is_line] * ratio * 0.5).astype(int)).tolist()
+            for p1, p2, color, width in zip(start.astype(int).tolist(), end.astype(int).tolist(),
+                                            colors[is_line].tolist(), thickness):
+                pygame.draw.line(screen, color, p1, p2, width)
+
+    def get_draw_rects(self):
+        """Screen tiles touched by any particle."""
+        n = self.count
+        if n == 0:
+            return []
+        # Lines trail up to their length behind the head, circles reach their size
+        reach = np.maximum(self.sizes[:n], self.lengths[:n]) + 2
+        return tile_rects(self.positions[:n, 0], self.positions[:n, 1], reach)
@@ -1,14 +1,17 @@
 import pygame
-import random
-from circleshape import CircleShape 
+import rng
+from circleshape import CircleShape, circle_rect
 from constants import PLAYER_RADIUS, LINE_WIDTH, PLAYER_TURN_SPEED, PLAYER_SHOOT_SPEED, PLAYER_SHOOT_COOLDOWN_SECONDS, SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_INVINCIBILITY_SECONDS, PLAYER_ACCELERATION, PLAYER_MAX_SPEED, PLAYER_DRAG, PLAYER_KNOCKBACK, PLAYER_WARP_DISTANCE, PLAYER_WARP_COOLDOWN_SECONDS, PLAYER_WARP_MAX_CHARGE_SECONDS, SPEED_BOOST_DURATION, SPEED_BOOST_MULTIPLIER, SPEED_BOOST_TRAIL_INTENSITY, TRAIL_OFFSET, BOOST_TRAIL_OFFSET
 from shot import Shot
 from engine_trail import EngineTrail
 from warp_effect import WarpEffect
 from rocket_weapon import RocketWeapon
 from mine_weapon import MineWeapon
+from player_input import PlayerInput
 
 class Player(CircleShape):
+    collision_layer = "player"
+    
     def __init__(self, x, y):
         super().__init__(x, y, PLAYER_RADIUS)
         self.rotation = 0
@@ -28,6 +31,25 @@ class Player(CircleShape):
         self.fired_projectiles = []  # Store projectiles to be added to sprite groups
         self.rocket_cooldown = 0
         self.mine_cooldown = 0
+        self.controls = PlayerInput()  # Set by the world before each update
+
+    def get_state(self):
+        return (self.shoot_timer, self.warp_timer, self.warp_charging, self.warp_charge_timer,
+                self.invincibility_timer, self.has_shield, self.shield_offset.x, self.shield_offset.y,
+                self.speed_boost_timer, self.rocket_cooldown, self.mine_cooldown,
+                self.rocket_weapon.ammo, self.mine_weapon.ammo)
+
+    def set_state(self, state):
+        (self.shoot_timer, self.warp_timer, warp_charging, self.warp_charge_timer,
+         self.invincibility_timer, has_shield, shield_x, shield_y,
+         self.speed_boost_timer, self.rocket_cooldown, self.mine_cooldown,
+         rocket_ammo, mine_ammo) = state[:13]
+        self.warp_charging = bool(warp_charging)
+        self.has_shield = bool(has_shield)
+        self.shield_offset = pygame.Vector2(shield_x, shield_y)
+        self.rocket_weapon.ammo = int(rocket_ammo)
+        self.mine_weapon.ammo = int(mine_ammo)
+        self.fired_projectiles = []
 
     def is_invincible(self):
         return self.invincibility_timer > 0
@@ -95,6 +117,11 @@ class Player(CircleShape):
         t = max(0, min(1, ap.dot(ab) / ab_len_sq))
         return a + ab * t
     
+    @property
+    def collision_reach(self):
+        """Ship corners reach past the collision radius, so the broadphase uses a wider circle."""
+        return self.radius * 2
+    
     def collides_with_circle(self, circle):
         """Check if this triangle collides with a circle (asteroid)."""
         tri = self.triangle()
@@ -114,10 +141,7 @@ class Player(CircleShape):
         return False
     
     def draw(self, screen):
-        # Draw engine trail first (behind ship)
-        self.engine_trail.draw(screen)
-        # Draw warp effect
-        self.warp_effect.draw(screen)
+        # Engine trail and warp particles are drawn by the particle system, behind the ship
         
         # Draw warp ghost preview when charging
         if self.warp_charging and self.can_warp():
@@ -138,6 +162,17 @@ class Player(CircleShape):
         
         pygame.draw.polygon(screen, 'white', self.triangle(), LINE_WIDTH)
     
+    def get_draw_rects(self):
+        # Shield back corners are the furthest points (see _get_shield_triangle)
+        corner = pygame.Vector2(self.radius + 10, self.radius / 1.5 + 10).length()
+        reach = corner + self.shield_offset.length() + LINE_WIDTH
+        rects = [circle_rect(self.position.x, self.position.y, reach)]
+        if self.warp_charging and self.can_warp():
+            ghost_pos, _ = self._get_warp_destination()
+            # The dashed line runs between the two, so their union covers it
+            rects.append(rects[0].union(circle_rect(ghost_pos.x, ghost_pos.y, self.radius * 1.25 + LINE_WIDTH)))
+        return rects
+    
     def _get_shield_triangle(self):
         """Get a larger triangle for the shield outline with parallax offset."""
         # Uniform gap between ship and shield on all sides
@@ -272,7 +307,7 @@ class Player(CircleShape):
             self.shield_offset = self.shield_offset.lerp(accel_offset, dt * 10)
         
         # Emit engine trail when thrusting forward
-        if direction > 0:
+        if direction > 0 and self.engine_trail.enabled:
             if self.has_speed_boost():
                 # For speed boost: emit from random points along the back edge of the triangle
                 forward = pygame.Vector2(0, 1).rotate(self.rotation)
@@ -283,7 +318,7 @@ class Player(CircleShape):
                 back_right = self.position - forward * self.radius * BOOST_TRAIL_OFFSET + right
                 
                 # Emit from random point along back edge
-                t = random.random()
+                t = rng.cosmetic.random()
                 emit_pos = back_left.lerp(back_right, t)
                 
                 intensity = SPEED_BOOST_TRAIL_INTENSITY
@@ -300,7 +335,7 @@ class Player(CircleShape):
         if self.shoot_timer > 0:
             return
         self.shoot_timer = PLAYER_SHOOT_COOLDOWN_SECONDS
-        shot = Shot(self.position.x, self.position.y)
+        shot = Shot.create(self.position.x, self.position.y)
         shot.velocity = pygame.Vector2(0, 1).rotate(self.rotation) * PLAYER_SHOOT_SPEED
 
     def fire_rockets(self):
@@ -440,20 +475,20 @@ class Player(CircleShape):
         # Update position based on velocity (momentum)
         self.position += self.velocity * dt
         
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_w]:
+        controls = self.controls
+        if controls.thrust:
             self.accelerate(dt, 1)
-        if keys[pygame.K_s]:
+        if controls.reverse:
             self.accelerate(dt, -0.5)  # Reverse thrust is weaker
-        if keys[pygame.K_a]:
+        if controls.rotate_left:
             self.rotate(-1, dt)
-        if keys[pygame.K_d]:
+        if controls.rotate_right:
             self.rotate(1, dt)
-        if keys[pygame.K_SPACE]:
+        if controls.shoot:
             self.shoot()
-        if keys[pygame.K_1]:
+        if controls.fire_rockets:
             self.fire_rockets()
-        if keys[pygame.K_2]:
+        if controls.deploy_mine:
             self.deploy_mine()
         
         self.wrap_around_screen()
\ No newline at end of file
@@ -0,0 +1,49 @@
+import pygame
+
+
+class PlayerInput:
+    """Snapshot of the player's controls for a single simulation step.
+    
+    Agents and recordings pass controls as a bitmask; see to_bits().
+    """
+    __slots__ = ('thrust', 'reverse', 'rotate_left', 'rotate_right',
+                 'shoot', 'fire_rockets', 'deploy_mine', 'warp')
+
+    def __init__(self, thrust=False, reverse=False, rotate_left=False, rotate_right=False,
+                 shoot=False, fire_rockets=False, deploy_mine=False, warp=False):
+        self.thrust = thrust
+        self.reverse = reverse
+        self.rotate_left = rotate_left
+        self.rotate_right = rotate_right
+        self.shoot = shoot
+        self.fire_rockets = fire_rockets
+        self.deploy_mine = deploy_mine
+        self.warp = warp  # Held state; the world turns press/release into warp charge/execute
+
+    @classmethod
+    def from_keys(cls, keys):
+        """Build inputs from a pygame.key.get_pressed() result."""
+        return cls(
+            thrust=keys[pygame.K_w],
+            reverse=keys[pygame.K_s],
+            rotate_left=keys[pygame.K_a],
+            rotate_right=keys[pygame.K_d],
+            shoot=keys[pygame.K_SPACE],
+            fire_rockets=keys[pygame.K_1],
+            deploy_mine=keys[pygame.K_2],
+            warp=keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT],
+        )
+
+    def to_bits(self):
+        """Pack the controls into one byte, bit i set for __slots__[i]."""
+        bits = 0
+        for index, name in enumerate(self.__slots__):
+            if getattr(self, name):
+                bits |= 1 << index
+        return bits
+
+    @classmethod
+    def from_bits(cls, bits):
+        """Inverse of to_bits(); accepts any int-like value, e.g. a NumPy uint8."""
+        bits = int(bits)
+        return cls(*((bits >> index) & 1 == 1 for index in range(len(cls.__slots__))))
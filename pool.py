@@ -0,0 +1,69 @@
+from constants import POOL_MAX_SIZE
+
+_pools = []
+
+
+class ObjectPool:
+    """Free list of killed sprites of exactly one class.
+
+    acquire() re-runs __init__ on a free sprite when there is one, which also
+    adds it back to the class's containers, and only constructs a new sprite
+    on a miss. Sprites come back through Pooled.kill().
+    """
+
+    def __init__(self, cls, max_size=POOL_MAX_SIZE):
+        self.cls = cls
+        self.max_size = max_size
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        self.dropped = 0  # Released while the free list was full
+        cls.pool = self
+        _pools.append(self)
+
+    def acquire(self, *args):
+        if self.free:
+            self.hits += 1
+            sprite = self.free.pop()
+            sprite.__init__(*args)
+            return sprite
+        self.misses += 1
+        return self.cls(*args)
+
+    def release(self, sprite):
+        if len(self.free) < self.max_size:
+            self.free.append(sprite)
+        else:
+            self.dropped += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "dropped": self.dropped, "free": len(self.free)}
+
+
+class Pooled:
+    """Mixin for sprites recycled through their class's ObjectPool.
+
+    Build them with cls.create(...) instead of cls(...). A class without a
+    pool of its own (e.g. an unpooled subclass) is constructed normally.
+    """
+
+    pool = None
+
+    @classmethod
+    def create(cls, *args):
+        pool = cls.__dict__.get("pool")
+        if pool is None:
+            return cls(*args)
+        return pool.acquire(*args)
+
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        pool = type(self).__dict__.get("pool")
+        if was_alive and pool is not None:
+            pool.release(self)
+
+
+def pool_stats():
+    """Hit/miss counts for every pool, keyed by class name."""
+    return {pool.cls.__name__: pool.stats() for pool in _pools}
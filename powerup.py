@@ -1,7 +1,7 @@
 import pygame
 import math
-import random
-from circleshape import CircleShape
+import rng
+from circleshape import CircleShape, circle_rect
 from constants import POWERUP_LIFETIME
 
 POWERUP_RADIUS = 15
@@ -11,6 +11,8 @@ POWERUP_SPEED = 30
 class PowerUp(CircleShape):
     """Base class for all power-ups. Inherits from CircleShape for collision detection."""
     
+    collision_layer = "powerup"
+    
     # Override in subclasses
     COLOR = 'white'
     ICON_COLOR = 'white'
@@ -21,9 +23,15 @@ class PowerUp(CircleShape):
         self.bob_timer = 0.0
         self.bob_offset = 0.0
         # Give a small random velocity
-        angle = random.uniform(0, 360)
+        angle = rng.gameplay.uniform(0, 360)
         self.velocity = pygame.Vector2(1, 0).rotate(angle) * POWERUP_SPEED
 
+    def get_state(self):
+        return (self.lifetime, self.bob_timer, self.bob_offset)
+
+    def set_state(self, state):
+        self.lifetime, self.bob_timer, self.bob_offset = state[:3]
+
     def update(self, dt):
         """Update powerup position and lifetime."""
         self.position += self.velocity * dt
@@ -57,6 +65,9 @@ class PowerUp(CircleShape):
         # Draw icon (override in subclasses)
         self._draw_icon(screen, self.position.x, draw_y)
 
+    def get_draw_rects(self):
+        return [circle_rect(self.position.x, self.position.y + self.bob_offset, self.radius + 2)]
+
     def _draw_icon(self, screen, x, y):
         """Override in subclasses to draw specific power-up icon."""
         pass
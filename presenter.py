@@ -0,0 +1,78 @@
+import numpy as np
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, DIRTY_RECT_MAX_COVERAGE, DIRTY_RECT_TILE_SIZE
+
+
+def tile_rects(x, y, reach, tile_size=DIRTY_RECT_TILE_SIZE):
+    """Dirty rects for many small circles, one rect per screen tile they touch.
+
+    x, y and reach are arrays; the number of rects is bounded by the tile
+    grid rather than by how many circles there are.
+    """
+    cols = -(-SCREEN_WIDTH // tile_size)
+    rows = -(-SCREEN_HEIGHT // tile_size)
+    # Tiles off screen are clamped onto a one-tile border that is never reported
+    x0 = np.clip(np.floor((x - reach) / tile_size).astype(int) + 1, 0, cols + 1)
+    x1 = np.clip(np.floor((x + reach) / tile_size).astype(int) + 1, 0, cols + 1)
+    y0 = np.clip(np.floor((y - reach) / tile_size).astype(int) + 1, 0, rows + 1)
+    y1 = np.clip(np.floor((y + reach) / tile_size).astype(int) + 1, 0, rows + 1)
+    touched = np.zeros((cols + 2, rows + 2), dtype=bool)
+    # A circle smaller than a tile spans at most two tiles per axis
+    small = ((x1 - x0) <= 1) & ((y1 - y0) <= 1)
+    for tx in (x0[small], x1[small]):
+        for ty in (y0[small], y1[small]):
+            touched[tx, ty] = True
+    for left, top, right, bottom in zip(x0[~small].tolist(), y0[~small].tolist(),
+                                        x1[~small].tolist(), y1[~small].tolist()):
+        touched[left:right + 1, top:bottom + 1] = True
+
+    tiles_x, tiles_y = np.nonzero(touched[1:cols + 1, 1:rows + 1])
+    return [pygame.Rect(tx * tile_size, ty * tile_size, tile_size, tile_size)
+            for tx, ty in zip(tiles_x.tolist(), tiles_y.tolist())]
+
+
+class DirtyRectPresenter:
+    """Pushes only the changed parts of the frame to the display.
+
+    The frame is still drawn in full; what gets skipped is presenting pixels
+    that did not change. Each frame updates the rects drawn this frame plus
+    the ones drawn last frame (so whatever moved away gets erased), and falls
+    back to a full flip when that would cover too much of the screen anyway.
+    """
+
+    def __init__(self, screen, max_coverage=DIRTY_RECT_MAX_COVERAGE):
+        self.screen_rect = screen.get_rect()
+        self.max_area = self.screen_rect.width * self.screen_rect.height * max_coverage
+        self.previous = []
+        self.full_frame = True  # The first frame has nothing to diff against
+        self.full_flips = 0
+        self.partial_updates = 0
+
+    def invalidate(self):
+        """Flip the whole screen next frame, e.g. after a state change or screen shake."""
+        self.full_frame = True
+
+    def present(self, rects):
+        """Show this frame, given the rects of everything that may have changed."""
+        current = []
+        for rect in rects:
+            clipped = rect.clip(self.screen_rect)
+            if clipped.width and clipped.height:
+                current.append(clipped)
+
+        dirty = self.previous + current
+        if not self.full_frame:
+            area = 0  # Overlaps are counted twice, which only errs towards flipping
+            for rect in dirty:
+                area += rect.width * rect.height
+            self.full_frame = area > self.max_area
+
+        if self.full_frame:
+            pygame.display.flip()
+            self.full_flips += 1
+        elif dirty:
+            pygame.display.update(dirty)
+            self.partial_updates += 1
+
+        self.previous = current
+        self.full_frame = False
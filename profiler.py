@@ -0,0 +1,138 @@
+import json
+import math
+import os
+import time
+from collections import deque
+from constants import PROFILER_ENABLED, PROFILER_HISTORY_FRAMES, PROFILER_TRACE_MAX_EVENTS
+
+__all__ = [
+    "phase", "record", "end_frame", "summary", "export_trace",
+    "set_enabled", "is_enabled", "reset",
+]
+
+_enabled = PROFILER_ENABLED
+_epoch = time.perf_counter()  # Trace timestamps are relative to this
+
+_current = {}  # Phase name -> seconds spent in it so far this frame
+_history = {}  # Phase name -> deque of per-frame seconds
+_frame_start = None
+_trace = deque(maxlen=PROFILER_TRACE_MAX_EVENTS)  # (name, start, duration), oldest dropped first
+
+
+class _Phase:
+    """Times one `with` block and records it under its phase name."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, self.start, time.perf_counter() - self.start)
+        return False
+
+
+class _NullPhase:
+    """Shared stand-in for _Phase while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def phase(name):
+    """Context manager timing a block as part of this frame's `name` phase.
+
+    While profiling is off this returns a shared no-op, so instrumented code
+    only pays for a function call and an empty `with`.
+    """
+    if not _enabled:
+        return _NULL_PHASE
+    return _Phase(name)
+
+
+def record(name, start, duration):
+    """Add an already measured span (perf_counter seconds) to this frame."""
+    if not _enabled:
+        return
+    _current[name] = _current.get(name, 0.0) + duration
+    _trace.append((name, start, duration))
+
+
+def end_frame():
+    """Close the current frame: store each phase's total and the whole frame time."""
+    global _frame_start
+    if not _enabled:
+        return
+    now = time.perf_counter()
+    if _frame_start is not None:
+        _current["frame"] = now - _frame_start
+    for name, seconds in _current.items():
+        samples = _history.get(name)
+        if samples is None:
+            samples = _history[name] = deque(maxlen=PROFILER_HISTORY_FRAMES)
+        samples.append(seconds)
+    _current.clear()
+    _frame_start = now
+
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summary():
+    """Rolling mean, p95 and p99 in milliseconds per phase, slowest mean first."""
+    rows = []
+    for name, samples in _history.items():
+        if not samples:
+            continue
+        ordered = sorted(samples)
+        rows.append((name, 1000 * sum(ordered) / len(ordered),
+                     1000 * _percentile(ordered, 0.95), 1000 * _percentile(ordered, 0.99)))
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows
+
+
+def export_trace(path):
+    """Write the recorded spans as a Chrome trace_event file (chrome://tracing, Perfetto).
+
+    Returns the number of events written.
+    """
+    pid = os.getpid()
+    events = [{"name": name, "cat": "frame", "ph": "X", "pid": pid, "tid": 1,
+               "ts": (start - _epoch) * 1e6, "dur": duration * 1e6}
+              for name, start, duration in _trace]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
+
+
+def set_enabled(enabled):
+    """Turn timing on or off; turning it on starts a fresh frame."""
+    global _enabled, _frame_start
+    _enabled = enabled
+    _current.clear()
+    _frame_start = None
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forget all recorded history and trace events."""
+    _current.clear()
+    _history.clear()
+    _trace.clear()
@@ -0,0 +1,132 @@
+import argparse
+import heapq
+import time
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, ASTEROID_ATLAS_ENABLED
+from input_recording import InputRecording
+from replay_archive import ARCHIVE_MAGIC, ReplayArchive
+from world import World
+from asteroid import Asteroid
+from asteroid_atlas import AsteroidAtlas
+from starfield import Starfield
+from ui import UI
+
+SLOWEST_FRAMES_REPORTED = 5
+MAX_DRAW_DT = 0.25  # Starfield drift and shake decay only ease, so longer gaps between draws are capped
+
+
+def draw(screen, world, starfield, ui, dt):
+    """Draw the playing screen like main.py does; dt is the game time since the last draw."""
+    player = world.player
+    dt = min(dt, MAX_DRAW_DT)
+    world.screen_shake.update(dt)
+    starfield.update(dt, player.velocity)
+    screen.fill('black')
+    starfield.draw(screen)
+    for drawable_sprite in world.drawable:
+        drawable_sprite.draw(screen)
+    if world.screen_shake.is_shaking():
+        world.screen_shake.apply(screen)
+    ui.draw_hud(screen, world.score, world.lives, player.get_warp_cooldown(),
+                player.is_warp_charging(), player.get_warp_charge_remaining(),
+                player.has_active_shield(), player.get_speed_boost_remaining(),
+                player.get_rocket_ammo(), player.get_mine_ammo())
+    pygame.display.flip()
+
+
+def open_recording(path):
+    """An InputRecording or, for a .pyrp file, a ReplayArchive."""
+    with open(path, "rb") as f:
+        magic = f.read(len(ARCHIVE_MAGIC))
+    return ReplayArchive(path) if magic == ARCHIVE_MAGIC else InputRecording(path)
+
+
+def replay(recording, speed=1.0, render_every=1, display=True, effects=True, start_at=0.0):
+    """Play a recording back through a fresh world seeded like the original.
+
+    speed scales the recorded dts against the wall clock (0 runs as fast as
+    possible); only every render_every-th frame is drawn. A ReplayArchive can
+    begin start_at seconds in, from its nearest keyframe. Returns the world
+    and the slowest steps as (seconds, frame) pairs.
+    """
+    screen = None
+    if display:
+        pygame.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Pyasteroids replay")
+        if ASTEROID_ATLAS_ENABLED:
+            Asteroid.atlas = AsteroidAtlas()
+        ui = UI()
+    if start_at:
+        first = recording.frame_at(start_at)
+        world = recording.seek(first, effects=effects)
+        frames = recording.inputs(first)
+    else:
+        first = 0
+        world = World(recording.seed, effects)
+        frames = iter(recording)
+    starfield = Starfield() if display else None
+
+    slowest = []  # Min-heap of the slowest steps
+    game_time = 0.0
+    undrawn_time = 0.0
+    start = time.perf_counter()
+    for frame, (inputs, dt) in enumerate(frames, first):
+        step_start = time.perf_counter()
+        world.step(dt, inputs)
+        step_seconds = time.perf_counter() - step_start
+        if len(slowest) < SLOWEST_FRAMES_REPORTED:
+            heapq.heappush(slowest, (step_seconds, frame))
+        else:
+            heapq.heappushpop(slowest, (step_seconds, frame))
+        game_time += dt
+        undrawn_time += dt
+
+        if display and frame % render_every == 0:
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            draw(screen, world, starfield, ui, undrawn_time)
+            undrawn_time = 0.0
+        if speed > 0:
+            # Hold the replay back to `speed` times the recorded pace
+            ahead = start + game_time / speed - time.perf_counter()
+            if ahead > 0:
+                time.sleep(ahead)
+        if world.game_over:
+            break
+
+    if display:
+        pygame.quit()
+    return world, sorted(slowest, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded game (.pyin or .pyrp) through the simulation.")
+    parser.add_argument("path", help="recording written with INPUT_RECORDING or REPLAY_ARCHIVE enabled")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="playback speed, 1 = real time, 10 = 10x, 0 = as fast as possible")
+    parser.add_argument("--render-every", type=int, default=1, metavar="N", help="draw only every Nth frame")
+    parser.add_argument("--no-display", action="store_true", help="simulate only, never open a window")
+    parser.add_argument("--no-effects", action="store_true", help="skip particles and other visual-only work")
+    parser.add_argument("--start", type=float, default=0.0, metavar="SECONDS",
+                        help="start this far into the game (replay archives only)")
+    args = parser.parse_args()
+
+    recording = open_recording(args.path)
+    if args.start and not isinstance(recording, ReplayArchive):
+        parser.error("--start needs a replay archive (.pyrp)")
+    if getattr(recording, "recovered", False):
+        print(f"{args.path} was not closed properly; replaying the {len(recording)} frames that were saved")
+    start = time.perf_counter()
+    world, slowest = replay(recording, args.speed, max(1, args.render_every),
+                            display=not args.no_display, effects=not args.no_effects, start_at=args.start)
+    elapsed = time.perf_counter() - start
+
+    print(f"frame {world.frame} of {len(recording)} reached in {elapsed:.2f}s (seed {recording.seed})")
+    print(f"score: {world.score}  lives: {world.lives}  game over: {world.game_over}")
+    for seconds, frame in slowest:
+        print(f"slow step: frame {frame} took {seconds * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
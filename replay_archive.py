@@ -0,0 +1,267 @@
+import bisect
+import mmap
+import os
+import struct
+import numpy as np
+from input_recording import INPUT_RECORD, INPUT_RECORD_DTYPE
+from player_input import PlayerInput
+from snapshot_store import ENTITY_STATE_DTYPE
+from world import World
+
+# File layout:
+#   header
+#   one segment per keyframe: a segment header, the keyframe, then the frame records that follow it
+#   index (one INDEX_DTYPE row per segment)
+#   footer
+# Frame records are the same as in a .pyin input recording (see input_recording.py).
+# Segment headers repeat what the index says about them, so an archive whose
+# index was never written (a crash) can still be opened by scanning them.
+ARCHIVE_MAGIC = b"PYASTRP2"
+ARCHIVE_HEADER = struct.Struct("<8sq")  # Magic, world seed
+ARCHIVE_FOOTER = struct.Struct("<QQ8s")  # Index offset, segment count, magic
+SEGMENT_MAGIC = b"PYASTSEG"
+SEGMENT_HEADER = struct.Struct("<8sQdQQ")  # Magic, frame, time, keyframe bytes, frame records
+OPEN_SEGMENT = 2 ** 64 - 1  # Record count of a segment still being written: it runs to the end of the file
+_RECORDS_FIELD = struct.Struct("<Q")
+_RECORDS_FIELD_OFFSET = SEGMENT_HEADER.size - _RECORDS_FIELD.size
+_FLUSH_FRAMES = 60  # Records written between flushes, so a crash loses at most a second
+INDEX_DTYPE = np.dtype([
+    ("frame", "<u8"),  # World.frame when the keyframe was taken
+    ("time", "<f8"),  # Game time (sum of recorded dts) at the keyframe
+    ("keyframe_offset", "<u8"),
+    ("records_offset", "<u8"),  # Frame records start right after the keyframe
+    ("records", "<u8"),  # Frame records in the segment
+])
+
+# A keyframe is the world scalars, both random streams, then the entity rows
+KEYFRAME_HEADER = struct.Struct("<qqi??ddI")  # Frame, score, lives, game over, warp held, spawn timer, shake, entities
+_MT_WORDS = 625  # Mersenne Twister state: 624 words and the position
+RANDOM_STATE_DTYPE = np.dtype([
+    ("version", "<u4"),
+    ("words", "<u4", (_MT_WORDS,)),
+    ("gauss_next", "<f8"),  # NaN for None
+])
+_STREAMS = 2  # gameplay, cosmetic (see RandomStreams.getstate)
+
+
+def encode_keyframe(snapshot):
+    """Bytes for a World.snapshot()."""
+    entities = snapshot["entities"]
+    header = KEYFRAME_HEADER.pack(snapshot["frame"], snapshot["score"], snapshot["lives"],
+                                  snapshot["game_over"], snapshot["warp_held"],
+                                  snapshot["spawn_timer"], snapshot["shake"], len(entities))
+    streams = np.zeros(_STREAMS, dtype=RANDOM_STATE_DTYPE)
+    for stream, (version, words, gauss_next) in zip(streams, snapshot["random"]):
+        stream["version"] = version
+        stream["words"] = words
+        stream["gauss_next"] = np.nan if gauss_next is None else gauss_next
+    return header + streams.tobytes() + np.ascontiguousarray(entities, dtype=ENTITY_STATE_DTYPE).tobytes()
+
+
+def decode_keyframe(buffer, offset=0):
+    """World.snapshot() stored at `offset` in `buffer`; entity rows are copied out of it."""
+    (frame, score, lives, game_over, warp_held,
+     spawn_timer, shake, count) = KEYFRAME_HEADER.unpack_from(buffer, offset)
+    offset += KEYFRAME_HEADER.size
+    streams = np.frombuffer(buffer, dtype=RANDOM_STATE_DTYPE, count=_STREAMS, offset=offset)
+    offset += streams.nbytes
+    random_state = tuple(
+        (int(version), tuple(words.tolist()), None if np.isnan(gauss_next) else float(gauss_next))
+        for version, words, gauss_next in streams.tolist())
+    entities = np.frombuffer(buffer, dtype=ENTITY_STATE_DTYPE, count=count, offset=offset).copy()
+    return {
+        "frame": frame,
+        "score": score,
+        "lives": lives,
+        "game_over": game_over,
+        "warp_held": warp_held,
+        "spawn_timer": spawn_timer,
+        "shake": shake,
+        "random": random_state,
+        "entities": entities,
+    }
+
+
+class ReplayWriter:
+    """Records a game as a seekable replay archive (.pyrp).
+
+    Call record() with each frame's inputs and dt just before stepping the
+    world, like InputRecorder. Every keyframe_seconds of game time it first
+    stores a keyframe of the world, so a viewer can start anywhere by
+    restoring one and stepping at most that long. The file is flushed after
+    every keyframe and every _FLUSH_FRAMES records. close() adds the index;
+    without it (a crash) ReplayArchive rebuilds the index from the segment
+    headers and drops a trailing partial record or keyframe.
+    """
+
+    def __init__(self, path, seed, world, keyframe_seconds):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.world = world
+        self.keyframe_seconds = keyframe_seconds
+        self.file = open(path, "wb")
+        self.file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, seed))
+        self.offset = ARCHIVE_HEADER.size
+        self.index = []  # INDEX_DTYPE rows as lists
+        self.time = 0.0
+        self.next_keyframe = 0.0
+
+    def record(self, inputs, dt):
+        if self.time >= self.next_keyframe:
+            self._write_keyframe()
+        self.file.write(INPUT_RECORD.pack(inputs.to_bits(), dt))
+        self.offset += INPUT_RECORD.size
+        self.index[-1][4] += 1
+        self.time += dt
+        if self.index[-1][4] % _FLUSH_FRAMES == 0:
+            self.file.flush()
+
+    def _end_segment(self):
+        """Write the final record count into the open segment's header."""
+        if not self.index:
+            return
+        keyframe_offset, records = self.index[-1][2], self.index[-1][4]
+        self.file.seek(keyframe_offset - SEGMENT_HEADER.size + _RECORDS_FIELD_OFFSET)
+        self.file.write(_RECORDS_FIELD.pack(records))
+        self.file.seek(self.offset)
+
+    def _write_keyframe(self):
+        self._end_segment()
+        data = encode_keyframe(self.world.snapshot())
+        self.file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, self.world.frame, self.time, len(data), OPEN_SEGMENT))
+        self.file.write(data)
+        self.file.flush()
+        keyframe_offset = self.offset + SEGMENT_HEADER.size
+        self.index.append([self.world.frame, self.time, keyframe_offset, keyframe_offset + len(data), 0])
+        self.offset = keyframe_offset + len(data)
+        self.next_keyframe = self.time + self.keyframe_seconds
+
+    def close(self):
+        if self.file.closed:
+            return
+        self._end_segment()
+        index = np.array([tuple(row) for row in self.index], dtype=INDEX_DTYPE)
+        self.file.write(index.tobytes())
+        self.file.write(ARCHIVE_FOOTER.pack(self.offset, len(index), ARCHIVE_MAGIC))
+        self.file.close()
+
+
+class ReplayArchive:
+    """A replay archive opened for random access through a read-only memory map.
+
+    Only the index is read up front; keyframes and frame records are read
+    from the map when a frame is asked for. Iterating yields (PlayerInput, dt)
+    for every frame, like InputRecording. An archive that was never closed
+    is opened by scanning its segments instead (`recovered` is then True).
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < ARCHIVE_HEADER.size:
+                raise ValueError(f"{path} is too short to be a replay archive")
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.seed = ARCHIVE_HEADER.unpack_from(self.map, 0)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f"{path} is not a replay archive")
+        end_magic = None
+        if size >= ARCHIVE_HEADER.size + ARCHIVE_FOOTER.size:
+            index_offset, segments, end_magic = ARCHIVE_FOOTER.unpack_from(self.map, size - ARCHIVE_FOOTER.size)
+        self.recovered = end_magic != ARCHIVE_MAGIC
+        if self.recovered:
+            self.index = self._scan_segments(size)
+        else:
+            self.index = np.frombuffer(self.map, dtype=INDEX_DTYPE, count=segments, offset=index_offset).copy()
+        self.keyframe_frames = self.index["frame"].tolist()
+
+    def _scan_segments(self, size):
+        """Rebuild the index from the segment headers, up to the last complete keyframe."""
+        rows = []
+        offset = ARCHIVE_HEADER.size
+        while offset + SEGMENT_HEADER.size <= size:
+            magic, frame, time, keyframe_bytes, records = SEGMENT_HEADER.unpack_from(self.map, offset)
+            keyframe_offset = offset + SEGMENT_HEADER.size
+            records_offset = keyframe_offset + keyframe_bytes
+            if magic != SEGMENT_MAGIC or records_offset > size:
+                break
+            # The open segment runs to the end of the file; either way a partial record is dropped
+            records = min(records, (size - records_offset) // INPUT_RECORD.size)
+            rows.append((frame, time, keyframe_offset, records_offset, records))
+            offset = records_offset + records * INPUT_RECORD.size
+        return np.array(rows, dtype=INDEX_DTYPE)
+
+    def __len__(self):
+        """Frames recorded, counting from the first keyframe."""
+        if not len(self.index):
+            return 0
+        last = self.index[-1]
+        return int(last["frame"] + last["records"] - self.index[0]["frame"])
+
+    def segment_records(self, segment):
+        """Frame records of one segment, as a view into the map."""
+        entry = self.index[segment]
+        return np.frombuffer(self.map, dtype=INPUT_RECORD_DTYPE, count=int(entry["records"]),
+                             offset=int(entry["records_offset"]))
+
+    def keyframe(self, segment):
+        return decode_keyframe(self.map, int(self.index[segment]["keyframe_offset"]))
+
+    def _segment_of(self, frame):
+        """Segment holding the latest keyframe at or before `frame`."""
+        if not self.keyframe_frames or frame < self.keyframe_frames[0]:
+            raise IndexError(f"frame {frame} is before the start of the archive")
+        return bisect.bisect_right(self.keyframe_frames, frame) - 1
+
+    def inputs(self, start=None):
+        """Yield (PlayerInput, dt) for the steps that follow World.frame == start."""
+        if not self.keyframe_frames:
+            return
+        if start is None:
+            start = self.keyframe_frames[0]
+        first = self._segment_of(start)
+        skip = start - self.keyframe_frames[first]
+        for segment in range(first, len(self.index)):
+            records = self.segment_records(segment)[skip:]
+            skip = 0
+            for bits, dt in zip(records["bits"].tolist(), records["dt"].tolist()):
+                yield PlayerInput.from_bits(bits), dt
+
+    def __iter__(self):
+        return self.inputs()
+
+    def frame_at(self, seconds):
+        """The world frame reached after `seconds` of recorded game time."""
+        segment = max(0, int(np.searchsorted(self.index["time"], seconds, side="right")) - 1)
+        entry = self.index[segment]
+        elapsed = np.cumsum(self.segment_records(segment)["dt"]) + entry["time"]
+        return int(entry["frame"]) + int(np.searchsorted(elapsed, seconds, side="right"))
+
+    def seek(self, frame, world=None, effects=True):
+        """A world at World.frame == frame: the nearest keyframe, stepped forward.
+
+        Restores into `world` when given, otherwise into a new World.
+        """
+        frame = min(frame, self.keyframe_frames[-1] + int(self.index[-1]["records"]))
+        segment = self._segment_of(frame)
+        if world is None:
+            world = World(self.seed, effects)
+        world.restore(self.keyframe(segment))
+        records = self.segment_records(segment)[:frame - self.keyframe_frames[segment]]
+        for bits, dt in zip(records["bits"].tolist(), records["dt"].tolist()):
+            world.step(dt, PlayerInput.from_bits(bits))
+        return world
+
+    def close(self):
+        self.index = None
+        try:
+            self.map.close()
+        except BufferError:
+            pass  # A caller still holds records; the mapping goes when they do
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,56 @@
+import random
+
+__all__ = ["RandomStreams", "use", "seed", "gameplay", "cosmetic"]
+
+
+class RandomStreams:
+    """Named random.Random streams for one simulation.
+
+    `gameplay` drives everything that can change the outcome of a game
+    (spawns, splits, drops, drift). `cosmetic` drives everything that only
+    changes how it looks (particles, shake, stars, asteroid outlines).
+    Because they never share draws, skipping or adding cosmetic work cannot
+    change a seeded game.
+    """
+
+    def __init__(self, seed=None):
+        self.gameplay = random.Random()
+        self.cosmetic = random.Random()
+        self.seed(seed)
+
+    def seed(self, value=None):
+        """Reseed both streams; None seeds them from the OS like random.seed()."""
+        if value is None:
+            self.gameplay.seed()
+            self.cosmetic.seed()
+        else:
+            # String seeds are hashed, so the two streams start far apart
+            self.gameplay.seed(f"gameplay:{value}")
+            self.cosmetic.seed(f"cosmetic:{value}")
+
+    def getstate(self):
+        return self.gameplay.getstate(), self.cosmetic.getstate()
+
+    def setstate(self, state):
+        gameplay_state, cosmetic_state = state
+        self.gameplay.setstate(gameplay_state)
+        self.cosmetic.setstate(cosmetic_state)
+
+
+_streams = RandomStreams()
+# Call sites use rng.gameplay / rng.cosmetic, looked up at call time so use() can switch them
+gameplay = _streams.gameplay
+cosmetic = _streams.cosmetic
+
+
+def use(streams):
+    """Make `streams` the ones module-level callers draw from (see World.activate)."""
+    global _streams, gameplay, cosmetic
+    _streams = streams
+    gameplay = streams.gameplay
+    cosmetic = streams.cosmetic
+
+
+def seed(value=None):
+    """Reseed the streams currently in use."""
+    _streams.seed(value)
@@ -1,10 +1,9 @@
 import math
-import random
 import pygame
+import rng
 from circleshape import CircleShape
 from constants import (ROCKET_SPEED, ROCKET_TURN_SPEED, ROCKET_LIFETIME, 
                        ROCKET_RADIUS, SCREEN_WIDTH, SCREEN_HEIGHT)
-from particle import Particle
 from particle_effect import ParticleEffect
 
 
@@ -18,84 +17,103 @@ class RocketTrail(ParticleEffect):
     
     def emit(self, x, y, direction):
         """Emit flame particles behind the rocket."""
+        if not self.enabled:
+            return
         base_angle = math.atan2(direction.y, direction.x)
         
+        speeds, angles, lifetimes, sizes, colors = [], [], [], [], []
         for _ in range(2):
-            angle = base_angle + random.uniform(-0.3, 0.3)
-            speed = random.uniform(60, 120)
-            lifetime = random.uniform(0.15, 0.3)
-            color = random.choice(self.TRAIL_COLORS)
-            size = random.uniform(2, 4)
-            
-            particle = Particle.create_radial(x, y, color, speed, angle, lifetime, size)
-            self._add_particle(particle)
+            angles.append(base_angle + rng.cosmetic.uniform(-0.3, 0.3))
+            speeds.append(rng.cosmetic.uniform(60, 120))
+            lifetimes.append(rng.cosmetic.uniform(0.15, 0.3))
+            colors.append(rng.cosmetic.choice(self.TRAIL_COLORS))
+            sizes.append(rng.cosmetic.uniform(2, 4))
+        
+        self._emit_radial(x, y, speeds, angles, lifetimes, sizes, colors)
 
 
 class Rocket(CircleShape):
     """Homing rocket that seeks the nearest asteroid."""
     
     containers = None  # Set by main.py
+    collision_layer = "rocket"
     asteroids_group = None  # Reference to asteroids for targeting
     player_ref = None  # Reference to player object for targeting
     taken_targets = None  # Set of asteroids already targeted by other rockets
+    asteroid_index = None  # SpatialHash over asteroids, rebuilt by the world each frame
     
     def __init__(self, x, y, rotation, initial_velocity):
         super().__init__(x, y, ROCKET_RADIUS)
         self.rotation = rotation
         self.lifetime = ROCKET_LIFETIME
         self.target = None
+        self.target_id = None  # Pooled asteroids are reused, so remember which one we chase
         self.trail = RocketTrail()
         
         # Set initial velocity in the direction we're facing + some of player velocity
         forward = pygame.Vector2(0, 1).rotate(rotation)
         self.velocity = forward * ROCKET_SPEED + initial_velocity * 0.3
     
+    @classmethod
+    def acquire_targets(cls, origin, count):
+        """Pick targets for `count` rockets at once and mark them as taken.
+        
+        Rockets get the nearest asteroids to origin that nobody else is
+        chasing; if those run out, the rest share the nearest asteroid overall.
+        """
+        if not cls.asteroids_group:
+            return []
+        taken = cls.taken_targets if cls.taken_targets is not None else set()
+        
+        def untaken(asteroid):
+            return asteroid not in taken and asteroid.alive()
+        
+        if cls.asteroid_index is not None:
+            targets = cls.asteroid_index.nearest(origin, count, untaken)
+            if len(targets) < count:
+                targets += cls.asteroid_index.nearest(origin, 1, pygame.sprite.Sprite.alive) * (count - len(targets))
+        else:
+            # No index this frame: scan the group (stable sort keeps group order for ties)
+            by_distance = sorted(cls.asteroids_group, key=lambda asteroid: origin.distance_to(asteroid.position))
+            targets = [asteroid for asteroid in by_distance if asteroid not in taken][:count]
+            if len(targets) < count and by_distance:
+                targets += by_distance[:1] * (count - len(targets))
+        
+        # Register these targets as taken
+        if cls.taken_targets is not None:
+            cls.taken_targets.update(targets)
+        return targets
+    
+    @classmethod
+    def assign_targets(cls, rockets):
+        """Give a freshly fired volley its targets with one batched query."""
+        if not rockets:
+            return
+        # Use player position for targeting, fall back to rocket position
+        origin = cls.player_ref.position if cls.player_ref else rockets[0].position
+        for rocket, target in zip(rockets, cls.acquire_targets(origin, len(rockets))):
+            rocket.target = target
+            rocket.target_id = target.entity_id
+    
     def _find_target(self):
         """Find the nearest asteroid to the player that isn't already targeted."""
-        if not self.asteroids_group:
-            return None
-        
-        # Use player position for targeting, fall back to rocket position
         target_from = Rocket.player_ref.position if Rocket.player_ref else self.position
-        taken = Rocket.taken_targets if Rocket.taken_targets else set()
-        
-        nearest = None
-        nearest_dist = float('inf')
-        
-        for asteroid in self.asteroids_group:
-            # Skip asteroids already targeted by other rockets
-            if asteroid in taken:
-                continue
-            dist = target_from.distance_to(asteroid.position)
-            if dist < nearest_dist:
-                nearest_dist = dist
-                nearest = asteroid
-        
-        # If all asteroids are taken, find any nearest
-        if nearest is None:
-            for asteroid in self.asteroids_group:
-                dist = target_from.distance_to(asteroid.position)
-                if dist < nearest_dist:
-                    nearest_dist = dist
-                    nearest = asteroid
-        
-        # Register this target as taken
-        if nearest and Rocket.taken_targets is not None:
-            Rocket.taken_targets.add(nearest)
-        
-        return nearest
+        targets = Rocket.acquire_targets(target_from, 1)
+        return targets[0] if targets else None
     
     def _release_target(self):
         """Release the current target so other rockets can use it."""
-        if self.target and Rocket.taken_targets is not None:
+        # A recycled target now belongs to whoever claimed the new asteroid, so leave it alone
+        if self.target and Rocket.taken_targets is not None and self.target.entity_id == self.target_id:
             Rocket.taken_targets.discard(self.target)
     
     def _steer_towards_target(self, dt):
         """Steer the rocket towards its target."""
-        if not self.target or not self.target.alive():
+        if not self.target or not self.target.alive() or self.target.entity_id != self.target_id:
             # Release old target and find new one
             self._release_target()
             self.target = self._find_target()
+            self.target_id = self.target.entity_id if self.target else None
         
         if not self.target:
             return
@@ -128,6 +146,14 @@ class Rocket(CircleShape):
         forward = pygame.Vector2(0, 1).rotate(self.rotation)
         self.velocity = forward * ROCKET_SPEED
     
+    def get_state(self):
+        # The target itself is linked up by the world
+        return (self.lifetime, self.target_id or 0)
+    
+    def set_state(self, state):
+        self.lifetime = state[0]
+        self.target_id = int(state[1]) or None
+    
     def kill(self):
         """Override kill to release target tracking."""
         self._release_target()
@@ -146,15 +172,11 @@ class Rocket(CircleShape):
         back_dir = -self.velocity.normalize() if self.velocity.length() > 0 else pygame.Vector2(0, -1)
         trail_pos = self.position + back_dir * self.radius
         self.trail.emit(trail_pos.x, trail_pos.y, back_dir)
-        self.trail.update(dt)
         
         # Wrap around screen
         self.wrap_around_screen()
     
     def draw(self, screen):
-        # Draw trail first
-        self.trail.draw(screen)
-        
         # Draw rocket body (small triangle)
         forward = pygame.Vector2(0, 1).rotate(self.rotation)
         right = pygame.Vector2(0, 1).rotate(self.rotation + 90) * self.radius / 2
@@ -186,17 +208,17 @@ class RocketExplosion(ParticleEffect):
     
     def _create_burst(self, x, y):
         """Create explosion particles."""
+        speeds, angles, lifetimes, sizes, colors = [], [], [], [], []
         for _ in range(25):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(80, 200)
-            lifetime = random.uniform(0.3, 0.6)
-            color = random.choice(self.EXPLOSION_COLORS)
-            size = random.uniform(2, 5)
-            
-            particle = Particle.create_radial(x, y, color, speed, angle, lifetime, size)
-            self._add_particle(particle)
+            angles.append(rng.cosmetic.uniform(0, 2 * math.pi))
+            speeds.append(rng.cosmetic.uniform(80, 200))
+            lifetimes.append(rng.cosmetic.uniform(0.3, 0.6))
+            colors.append(rng.cosmetic.choice(self.EXPLOSION_COLORS))
+            sizes.append(rng.cosmetic.uniform(2, 5))
+        
+        self._emit_radial(x, y, speeds, angles, lifetimes, sizes, colors)
     
     def update(self, dt):
         super().update(dt)
-        if len(self.particles) == 0:
+        if not self.has_particles():
             self.kill()
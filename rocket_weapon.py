@@ -23,6 +23,7 @@ class RocketWeapon(Weapon):
             rocket = Rocket(x, y, rotation + angle_offset, velocity)
             rockets.append(rocket)
         
+        Rocket.assign_targets(rockets)
         return rockets
     
     def get_name(self):
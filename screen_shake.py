@@ -1,5 +1,5 @@
-import random
 import pygame
+import rng
 from constants import SHAKE_DECAY
 
 
@@ -18,8 +18,8 @@ class ScreenShake:
         """Update shake offset and decay intensity."""
         if self.intensity > 0:
             # Random offset based on intensity
-            self.offset.x = random.uniform(-self.intensity, self.intensity)
-            self.offset.y = random.uniform(-self.intensity, self.intensity)
+            self.offset.x = rng.cosmetic.uniform(-self.intensity, self.intensity)
+            self.offset.y = rng.cosmetic.uniform(-self.intensity, self.intensity)
             # Decay
             self.intensity = max(0, self.intensity - SHAKE_DECAY * dt * self.intensity)
         else:
@@ -33,3 +33,23 @@ class ScreenShake:
     def is_shaking(self):
         """Check if screen is currently shaking."""
         return self.intensity > 0.1
+    
+    def apply(self, surface):
+        """Shift everything drawn so far by the current offset, in place.
+        
+        Reuses the frame that was just drawn instead of re-rendering the
+        scene into a second surface; strips uncovered by the shift are cleared.
+        """
+        dx, dy = self.get_offset()
+        if dx == 0 and dy == 0:
+            return
+        surface.scroll(dx, dy)
+        width, height = surface.get_size()
+        if dx > 0:
+            surface.fill('black', (0, 0, dx, height))
+        elif dx < 0:
+            surface.fill('black', (width + dx, 0, -dx, height))
+        if dy > 0:
+            surface.fill('black', (0, 0, width, dy))
+        elif dy < 0:
+            surface.fill('black', (0, height + dy, width, -dy))
@@ -0,0 +1,222 @@
+import os
+import numpy as np
+
+# One .npy file per column inside a session directory, so each column can be
+# memory-mapped on its own and readers only touch the columns they need.
+SNAPSHOT_COLUMNS = {
+    "frame": np.dtype("<u4"),
+    "type": np.dtype("u1"),
+    "id": np.dtype("<u4"),
+    "x": np.dtype("<f4"),
+    "y": np.dtype("<f4"),
+    "vx": np.dtype("<f4"),
+    "vy": np.dtype("<f4"),
+    "radius": np.dtype("<f4"),
+    "rotation": np.dtype("<f4"),
+}
+
+# Entity type codes stored in the "type" column
+ENTITY_TYPES = ("Player", "Asteroid", "Shot", "Rocket", "Mine",
+                "ShieldPowerUp", "SpeedPowerUp", "RocketPickup", "MinePickup")
+UNKNOWN_TYPE = 255
+_TYPE_CODES = {name: code for code, name in enumerate(ENTITY_TYPES)}
+
+# Full-precision rows for World.snapshot(): the columns above for every gameplay
+# entity, plus what the world links between them and each entity's get_state()
+ENTITY_STATE_SLOTS = 16  # Floats per entity for get_state(); the player uses the most (13)
+ENTITY_STATE_DTYPE = np.dtype([
+    ("type", "u1"),
+    ("id", "<u8"),
+    ("x", "<f8"),
+    ("y", "<f8"),
+    ("vx", "<f8"),
+    ("vy", "<f8"),
+    ("radius", "<f8"),
+    ("rotation", "<f8"),
+    ("target", "<u8"),  # Id of the live asteroid a rocket is chasing, 0 for none
+    ("taken", "?"),  # Asteroid already chased by a rocket (World.taken_targets)
+    ("state", "<f8", (ENTITY_STATE_SLOTS,)),
+])
+
+_NPY_HEADER_BYTES = 128  # Fixed so the header can be rewritten as the row count grows
+
+
+def build_columns(frame, sprites):
+    """Copy the fields of the given sprites into one array per column."""
+    type_codes, ids, xs, ys, vxs, vys, radii, rotations = [], [], [], [], [], [], [], []
+    for sprite in sprites:
+        type_codes.append(_TYPE_CODES.get(sprite.__class__.__name__, UNKNOWN_TYPE))
+        ids.append(getattr(sprite, "entity_id", 0))
+        xs.append(sprite.position.x)
+        ys.append(sprite.position.y)
+        vxs.append(sprite.velocity.x)
+        vys.append(sprite.velocity.y)
+        radii.append(sprite.radius)
+        rotations.append(getattr(sprite, "rotation", 0.0))
+    values = {"type": type_codes, "id": ids, "x": xs, "y": ys, "vx": vxs, "vy": vys,
+              "radius": radii, "rotation": rotations}
+    columns = {"frame": np.full(len(ids), frame, dtype=SNAPSHOT_COLUMNS["frame"])}
+    for name, column in values.items():
+        columns[name] = np.array(column, dtype=SNAPSHOT_COLUMNS[name])
+    return columns
+
+
+def build_entity_states(sprites, taken_targets=()):
+    """Copy everything needed to rebuild the given sprites into ENTITY_STATE_DTYPE rows.
+
+    Sprites whose type is not in ENTITY_TYPES (effects, the asteroid field)
+    are skipped.
+    """
+    sprites = [sprite for sprite in sprites if sprite.__class__.__name__ in _TYPE_CODES]
+    rows = np.zeros(len(sprites), dtype=ENTITY_STATE_DTYPE)
+    for row, sprite in zip(rows, sprites):
+        target = getattr(sprite, "target", None)
+        state = sprite.get_state()
+        row["type"] = _TYPE_CODES[sprite.__class__.__name__]
+        row["id"] = sprite.entity_id
+        row["x"], row["y"] = sprite.position
+        row["vx"], row["vy"] = sprite.velocity
+        row["radius"] = sprite.radius
+        row["rotation"] = getattr(sprite, "rotation", 0.0)
+        row["target"] = target.entity_id if target is not None and target.alive() else 0
+        row["taken"] = sprite in taken_targets
+        row["state"][:len(state)] = state
+    return rows
+
+
+class _NpyAppender:
+    """Appends to a 1-D .npy file, keeping its header valid after every write."""
+
+    def __init__(self, path, dtype):
+        self.dtype = dtype
+        self.count = 0
+        self.file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+            np.lib.format.dtype_to_descr(self.dtype), self.count)
+        # Magic, version 1.0, then a little-endian u16 header length
+        prefix = b"\x93NUMPY\x01\x00"
+        header_len = _NPY_HEADER_BYTES - len(prefix) - 2
+        encoded = header.ljust(header_len - 1).encode("latin1") + b"\n"
+        self.file.seek(0)
+        self.file.write(prefix + header_len.to_bytes(2, "little") + encoded)
+        self.file.seek(0, os.SEEK_END)
+
+    def append(self, values):
+        self.file.write(np.ascontiguousarray(values, dtype=self.dtype).tobytes())
+        self.count += len(values)
+
+    def flush(self):
+        self._write_header()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class ColumnarSnapshotWriter:
+    """State-log sink that stores snapshots as fixed-dtype columns.
+
+    Rows are buffered and written in chunks; each column file is a valid .npy
+    at every flush, so a session can be read while it is still being written.
+    """
+
+    def __init__(self, directory, chunk_rows=65536):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.pending = []
+        self.pending_rows = 0
+        self.columns = {name: _NpyAppender(os.path.join(directory, f"{name}.npy"), dtype)
+                        for name, dtype in SNAPSHOT_COLUMNS.items()}
+
+    def write(self, columns):
+        """Queue one snapshot (as returned by build_columns)."""
+        self.pending.append(columns)
+        self.pending_rows += len(columns["frame"])
+        if self.pending_rows >= self.chunk_rows:
+            self._write_chunk()
+
+    def _write_chunk(self):
+        if not self.pending:
+            return
+        for name, appender in self.columns.items():
+            appender.append(np.concatenate([columns[name] for columns in self.pending]))
+        self.pending = []
+        self.pending_rows = 0
+
+    def flush(self):
+        self._write_chunk()
+        for appender in self.columns.values():
+            appender.flush()
+
+    def close(self):
+        self._write_chunk()
+        for appender in self.columns.values():
+            appender.close()
+
+
+class SnapshotReader:
+    """Memory-mapped access to a columnar snapshot session.
+
+    Columns are opened lazily with np.load(mmap_mode="r"), so only the pages
+    actually touched are read from disk. Rows are stored in frame order.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._columns = {}
+
+    def column(self, name):
+        if name not in self._columns:
+            path = os.path.join(self.directory, f"{name}.npy")
+            self._columns[name] = np.load(path, mmap_mode="r")
+        return self._columns[name]
+
+    def __len__(self):
+        return len(self.column("frame"))
+
+    def frame_bounds(self, frame):
+        """Row range [start, end) holding the snapshot of the given frame."""
+        frames = self.column("frame")
+        start = int(np.searchsorted(frames, frame, side="left"))
+        end = int(np.searchsorted(frames, frame, side="right"))
+        return start, end
+
+    def read_frame(self, frame, columns=None):
+        """Get the requested columns (all by default) for one frame."""
+        start, end = self.frame_bounds(frame)
+        names = columns if columns is not None else SNAPSHOT_COLUMNS
+        return {name: np.asarray(self.column(name)[start:end]) for name in names}
+
+    def iter_chunks(self, chunk_rows=1 << 20, columns=None):
+        """Stream the session in row chunks that never split a frame."""
+        frames = self.column("frame")
+        names = columns if columns is not None else SNAPSHOT_COLUMNS
+        total = len(frames)
+        start = 0
+        while start < total:
+            end = min(start + chunk_rows, total)
+            if end < total:
+                # Back up to the start of the frame straddling the boundary
+                boundary = int(np.searchsorted(frames[start:end], frames[end], side="left")) + start
+                if boundary > start:
+                    end = boundary
+                else:
+                    end = int(np.searchsorted(frames, frames[start], side="right"))
+            yield {name: np.asarray(self.column(name)[start:end]) for name in names}
+            start = end
+
+    def iter_frames(self, chunk_rows=1 << 20, columns=None):
+        """Yield (frame, columns) for every snapshot, streaming chunk by chunk."""
+        names = list(columns) if columns is not None else list(SNAPSHOT_COLUMNS)
+        if "frame" not in names:
+            names.insert(0, "frame")
+        for chunk in self.iter_chunks(chunk_rows, names):
+            frames = chunk["frame"]
+            bounds = [0, *(np.flatnonzero(np.diff(frames)) + 1).tolist(), len(frames)]
+            for start, end in zip(bounds, bounds[1:]):
+                yield int(frames[start]), {name: values[start:end] for name, values in chunk.items()}
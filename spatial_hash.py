@@ -0,0 +1,125 @@
+import math
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, BROADPHASE_CELL_SIZE
+
+
+class SpatialHash:
+    """Uniform grid broadphase for circle shapes.
+
+    Cells are indexed modulo the grid size, so shapes that hang over a screen
+    edge (see CircleShape.wrap_around_screen) share buckets with shapes on the
+    opposite side. That only ever adds candidates, never drops them, and keeps
+    the table bounded no matter where a shape sits.
+    """
+
+    def __init__(self, cell_size=BROADPHASE_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(SCREEN_WIDTH / cell_size))
+        self.rows = max(1, math.ceil(SCREEN_HEIGHT / cell_size))
+        self.cells = {}
+        self.order = {}  # Insertion order, so candidates come back in group order
+        self.pair_tests = 0  # Candidates handed out since the last reset_stats()
+
+    def _cell_keys(self, x, y, radius):
+        """Yield the wrapped cell keys covered by a circle's bounding box."""
+        size = self.cell_size
+        x0 = math.floor((x - radius) / size)
+        x1 = min(math.floor((x + radius) / size), x0 + self.cols - 1)
+        y0 = math.floor((y - radius) / size)
+        y1 = min(math.floor((y + radius) / size), y0 + self.rows - 1)
+        for cy in range(y0, y1 + 1):
+            row = (cy % self.rows) * self.cols
+            for cx in range(x0, x1 + 1):
+                yield row + cx % self.cols
+
+    def clear(self):
+        self.cells.clear()
+        self.order.clear()
+
+    def insert(self, shape, radius=None):
+        """Add a shape using its current position and radius (or the given one)."""
+        if shape in self.order:
+            return
+        self.order[shape] = len(self.order)
+        if radius is None:
+            radius = shape.radius
+        for key in self._cell_keys(shape.position.x, shape.position.y, radius):
+            bucket = self.cells.get(key)
+            if bucket is None:
+                self.cells[key] = [shape]
+            else:
+                bucket.append(shape)
+
+    def rebuild(self, shapes):
+        """Clear the grid and insert every shape, preserving iteration order."""
+        self.clear()
+        for shape in shapes:
+            self.insert(shape)
+
+    def query(self, position, radius, exclude=None):
+        """Return shapes whose cells overlap the circle, in insertion order."""
+        found = set()
+        for key in self._cell_keys(position.x, position.y, radius):
+            bucket = self.cells.get(key)
+            if bucket:
+                found.update(bucket)
+        found.discard(exclude)
+        self.pair_tests += len(found)
+        return sorted(found, key=self.order.__getitem__)
+
+    def within(self, position, radius):
+        """Return shapes whose circles overlap the given circle, in insertion order."""
+        return [shape for shape in self.query(position, radius)
+                if position.distance_to(shape.position) < radius + shape.radius]
+
+    def _ring_keys(self, cx, cy, ring):
+        """Yield the wrapped keys of cells exactly `ring` cells away from (cx, cy)."""
+        if ring == 0:
+            yield (cy % self.rows) * self.cols + cx % self.cols
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            yield ((cy - ring) % self.rows) * self.cols + x % self.cols
+            yield ((cy + ring) % self.rows) * self.cols + x % self.cols
+        for y in range(cy - ring + 1, cy + ring):
+            row = (y % self.rows) * self.cols
+            yield row + (cx - ring) % self.cols
+            yield row + (cx + ring) % self.cols
+
+    def nearest(self, position, k=1, where=None):
+        """Return up to k shapes with centers nearest to position, closest first.
+        
+        Searches outward ring by ring and stops as soon as no unsearched cell
+        can hold a closer center. Shapes failing `where` are skipped; ties go
+        to the shape inserted first.
+        """
+        if not self.order or k <= 0:
+            return []
+        size = self.cell_size
+        cx = math.floor(position.x / size)
+        cy = math.floor(position.y / size)
+        # Any center closer than margin + ring * size lies in the rings searched so far
+        margin = min(position.x - cx * size, (cx + 1) * size - position.x,
+                     position.y - cy * size, (cy + 1) * size - position.y)
+        seen = set()
+        found = []  # (distance, insertion order, shape)
+        for ring in range(max(self.cols, self.rows) + 1):
+            for key in self._ring_keys(cx, cy, ring):
+                for shape in self.cells.get(key, ()):
+                    if shape in seen:
+                        continue
+                    seen.add(shape)
+                    if where is None or where(shape):
+                        found.append((position.distance_to(shape.position), self.order[shape], shape))
+            if len(found) >= k:
+                found.sort(key=lambda item: item[:2])
+                if found[k - 1][0] < margin + ring * size:
+                    break
+        self.pair_tests += len(seen)
+        found.sort(key=lambda item: item[:2])
+        return [shape for _, _, shape in found[:k]]
+
+    def query_shape(self, shape):
+        """Return candidate shapes that may overlap the given shape."""
+        return self.query(shape.position, shape.radius, exclude=shape)
+
+    def reset_stats(self):
+        self.pair_tests = 0
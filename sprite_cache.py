@@ -0,0 +1,60 @@
+from collections import OrderedDict
+import pygame
+from constants import (SPRITE_CACHE_MAX_ENTRIES, SPRITE_CACHE_RADIUS_BUCKET, SPRITE_CACHE_ALPHA_BUCKET,
+                       GLOW_RADIUS_BUCKET)
+
+_cache = OrderedDict()
+
+
+def _bucket(value, size):
+    """Round value to the nearest multiple of size."""
+    return int(round(value / size)) * size
+
+
+def _store(key, surface):
+    """Convert to the display format when possible and add to the LRU cache."""
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    _cache[key] = surface
+    if len(_cache) > SPRITE_CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return surface
+
+
+def get_glow(radius, color, max_alpha):
+    """Soft radial glow, brightest at the center. Blit centered, ideally with BLEND_ADD.
+    
+    The radius is rounded to GLOW_RADIUS_BUCKET, so center by the returned surface's size.
+    """
+    radius = max(GLOW_RADIUS_BUCKET, _bucket(radius, GLOW_RADIUS_BUCKET))
+    key = ('glow', radius, tuple(color), max_alpha)
+    surface = _cache.get(key)
+    if surface is not None:
+        _cache.move_to_end(key)
+        return surface
+    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    for i in range(radius, 0, -2):
+        alpha = int(max_alpha * (1 - i / radius))
+        pygame.draw.circle(surface, (*color, alpha), (radius, radius), i)
+    return _store(key, surface)
+
+
+def get_ring(radius, color, alpha, width):
+    """Translucent circle outline with a 2px margin. Blit centered by the returned surface's size.
+    
+    Radius and alpha are rounded to SPRITE_CACHE_RADIUS_BUCKET and SPRITE_CACHE_ALPHA_BUCKET.
+    """
+    radius = _bucket(radius, SPRITE_CACHE_RADIUS_BUCKET)
+    alpha = min(255, _bucket(alpha, SPRITE_CACHE_ALPHA_BUCKET))
+    key = ('ring', radius, tuple(color), alpha, width)
+    surface = _cache.get(key)
+    if surface is not None:
+        _cache.move_to_end(key)
+        return surface
+    surface = pygame.Surface((radius * 2 + 4, radius * 2 + 4), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (*color, alpha), (radius + 2, radius + 2), radius, width)
+    return _store(key, surface)
+
+
+def clear():
+    _cache.clear()
@@ -1,53 +1,104 @@
-import random
+import numpy as np
 import pygame
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT, STAR_COUNT, STAR_LAYERS, STAR_BASE_SPEED
+import rng
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, STAR_COUNT, STAR_LAYERS, STAR_BASE_SPEED,
+                       DIRTY_RECT_TILE_SIZE)
+from presenter import tile_rects
 
 
-class Star:
-    """A single star in the background."""
-    __slots__ = ('x', 'y', 'layer', 'size', 'brightness')
-    
-    def __init__(self, x, y, layer):
-        self.x = x
-        self.y = y
+class StarLayer:
+    """One parallax layer: stars fixed relative to each other, scrolled as a whole.
+
+    The stars are rendered once into a screen-sized tile, so drawing the
+    layer costs the same few blits however many stars it holds.
+    """
+
+    def __init__(self, layer, count):
         self.layer = layer  # 0 = far (slow, dim), higher = near (fast, bright)
+        self.speed_mult = (layer + 1) * 0.5
+        self.offset = np.zeros(2)  # Scroll of the whole layer, wrapped to the screen
+        self.positions = np.column_stack([
+            np.array([rng.cosmetic.randint(0, SCREEN_WIDTH) for _ in range(count)], dtype=float),
+            np.array([rng.cosmetic.randint(0, SCREEN_HEIGHT) for _ in range(count)], dtype=float),
+        ])
         # Size increases with layer
-        self.size = 1 if layer == 0 else (2 if layer < STAR_LAYERS - 1 else random.choice([2, 3]))
+        if layer == 0:
+            self.sizes = np.ones(count, dtype=int)
+        elif layer < STAR_LAYERS - 1:
+            self.sizes = np.full(count, 2)
+        else:
+            self.sizes = np.array([rng.cosmetic.choice([2, 3]) for _ in range(count)], dtype=int)
         # Brightness increases with layer
         base_brightness = 40 + layer * 50
-        self.brightness = min(255, base_brightness + random.randint(-20, 20))
+        self.brightness = np.array([min(255, base_brightness + rng.cosmetic.randint(-20, 20))
+                                    for _ in range(count)], dtype=np.uint8)
+        self.tile = self._render_tile()
+
+    def _render_tile(self):
+        """Draw every star at its unscrolled position onto a transparent tile."""
+        tile = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        xs = self.positions[:, 0].astype(int) % SCREEN_WIDTH
+        ys = self.positions[:, 1].astype(int) % SCREEN_HEIGHT
+
+        single = self.sizes == 1
+        pixels = pygame.surfarray.pixels3d(tile)
+        pixels[xs[single], ys[single]] = self.brightness[single, None]
+        del pixels  # Unlock the surface
+
+        for x, y, size, brightness in zip(xs[~single].tolist(), ys[~single].tolist(),
+                                          self.sizes[~single].tolist(), self.brightness[~single].tolist()):
+            color = (brightness, brightness, brightness)
+            # Stars near an edge also get drawn on the opposite side so the tile wraps seamlessly
+            for dx in (-SCREEN_WIDTH, 0, SCREEN_WIDTH):
+                if not -size <= x + dx < SCREEN_WIDTH + size:
+                    continue
+                for dy in (-SCREEN_HEIGHT, 0, SCREEN_HEIGHT):
+                    if -size <= y + dy < SCREEN_HEIGHT + size:
+                        pygame.draw.circle(tile, color, (x + dx, y + dy), size)
+
+        if pygame.display.get_surface() is not None:
+            tile = tile.convert()
+        tile.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        return tile
+
+    def scroll(self, dx, dy):
+        self.offset += (dx, dy)
+        self.offset %= (SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def get_positions(self):
+        """Current on-screen star positions."""
+        return (self.positions + self.offset) % (SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def draw(self, screen):
+        # The tile covers the screen exactly, so four blits tile any scroll offset
+        x = int(self.offset[0])
+        y = int(self.offset[1])
+        for tile_x in (x, x - SCREEN_WIDTH):
+            for tile_y in (y, y - SCREEN_HEIGHT):
+                screen.blit(self.tile, (tile_x, tile_y))
 
 
 class Starfield:
     """Parallax scrolling starfield background."""
-    
+
     def __init__(self, ambient_mode=False):
-        self.stars = []
-        self._init_stars()
+        stars_per_layer = STAR_COUNT // STAR_LAYERS
+        self.layers = [StarLayer(layer, stars_per_layer) for layer in range(STAR_LAYERS)]
         self.velocity = pygame.Vector2(0, 0)  # Will be influenced by player movement
         self.ambient_mode = ambient_mode
         # For ambient mode: slow random drift
         if ambient_mode:
             self._randomize_drift()
             self.drift_timer = 0.0
-    
+
     def _randomize_drift(self):
         """Set a new random drift direction for ambient mode."""
-        angle = random.uniform(0, 360)
-        speed = random.uniform(15, 35)  # Slow, gentle drift
+        angle = rng.cosmetic.uniform(0, 360)
+        speed = rng.cosmetic.uniform(15, 35)  # Slow, gentle drift
         self.velocity = pygame.Vector2(1, 0).rotate(angle) * speed
-    
-    def _init_stars(self):
-        """Create initial stars distributed across screen."""
-        stars_per_layer = STAR_COUNT // STAR_LAYERS
-        for layer in range(STAR_LAYERS):
-            for _ in range(stars_per_layer):
-                x = random.randint(0, SCREEN_WIDTH)
-                y = random.randint(0, SCREEN_HEIGHT)
-                self.stars.append(Star(x, y, layer))
-    
+
     def update(self, dt, player_velocity=None):
-        """Update star positions with parallax effect."""
+        """Scroll each layer with parallax."""
         if self.ambient_mode:
             # Slowly change drift direction over time
             self.drift_timer += dt
@@ -60,33 +111,29 @@ class Starfield:
                 self.velocity = self.velocity.lerp(-player_velocity * 0.1, dt * 2)
             else:
                 self.velocity = self.velocity.lerp(pygame.Vector2(0, 0), dt * 2)
-        
-        for star in self.stars:
-            # Layer speed multiplier (far = slow, near = fast)
-            speed_mult = (star.layer + 1) * 0.5
-            
-            # Move based on velocity and layer
-            star.x += self.velocity.x * speed_mult * dt
-            star.y += self.velocity.y * speed_mult * dt
-            
-            # Gentle drift
-            star.y += STAR_BASE_SPEED * speed_mult * dt * 0.2
-            
-            # Wrap around screen
-            if star.x < 0:
-                star.x = SCREEN_WIDTH
-            elif star.x > SCREEN_WIDTH:
-                star.x = 0
-            if star.y < 0:
-                star.y = SCREEN_HEIGHT
-            elif star.y > SCREEN_HEIGHT:
-                star.y = 0
-    
+
+        for layer in self.layers:
+            # Layer speed multiplier (far = slow, near = fast), plus a gentle downward drift
+            speed_mult = layer.speed_mult
+            layer.scroll(self.velocity.x * speed_mult * dt,
+                         (self.velocity.y + STAR_BASE_SPEED * 0.2) * speed_mult * dt)
+
     def draw(self, screen):
-        """Draw all stars."""
-        for star in self.stars:
-            color = (star.brightness, star.brightness, star.brightness)
-            if star.size == 1:
-                screen.set_at((int(star.x), int(star.y)), color)
-            else:
-                pygame.draw.circle(screen, color, (int(star.x), int(star.y)), star.size)
+        """Draw all layers, far to near."""
+        for layer in self.layers:
+            layer.draw(screen)
+
+    def get_draw_rects(self):
+        """Screen tiles touched by any star."""
+        positions = np.concatenate([layer.get_positions() for layer in self.layers])
+        reach = np.concatenate([layer.sizes for layer in self.layers]) + 1
+        # Stars hanging over an edge also show on the opposite side of the tile
+        for axis, size in ((0, SCREEN_WIDTH), (1, SCREEN_HEIGHT)):
+            coords = positions[:, axis]
+            wrapped = (coords < reach) | (coords > size - reach)
+            shifted = positions[wrapped]
+            shifted[:, axis] += np.where(coords[wrapped] < reach[wrapped], size, -size)
+            positions = np.concatenate([positions, shifted])
+            reach = np.concatenate([reach, reach[wrapped]])
+        # Stars are tiny and sparse, so finer tiles keep the dirty area small
+        return tile_rects(positions[:, 0], positions[:, 1], reach, DIRTY_RECT_TILE_SIZE // 2)
@@ -0,0 +1,19 @@
+import unittest
+from constants import SIMULATION_DT
+from headless import check_determinism, random_policy
+from logger import configure_event_log
+
+
+class DeterminismTest(unittest.TestCase):
+    """A seeded game plays out the same every time, with or without visual effects."""
+
+    def setUp(self):
+        configure_event_log(False)
+        self.addCleanup(configure_event_log, True)
+
+    def test_seeded_game_replays_exactly(self):
+        self.assertTrue(check_determinism(600, SIMULATION_DT, random_policy, seed=1234))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from asteroid import Asteroid
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from logger import configure_event_log
+from observation import ObservationEncoder
+from world import World
+
+GRID = 16
+CELL_WIDTH = SCREEN_WIDTH / GRID  # 80 px at 1280x720
+CELL_HEIGHT = SCREEN_HEIGHT / GRID  # 45 px
+
+
+class OccupancyGridTest(unittest.TestCase):
+    """Every grid cell an asteroid overlaps is marked, and no other."""
+
+    def setUp(self):
+        configure_event_log(False)
+        self.addCleanup(configure_event_log, True)
+        self.world = World()
+        self.encoder = ObservationEncoder(grid_size=GRID)
+
+    def occupied(self, x, y, radius):
+        Asteroid.create(x, y, radius)
+        grid = self.encoder.encode(self.world)[self.encoder.slices["grid"]].reshape(GRID, GRID)
+        return {(int(row), int(column)) for row, column in np.argwhere(grid)}
+
+    def test_small_asteroid_inside_one_cell(self):
+        # Covers no cell centre, but sits entirely in row 1, column 1
+        cells = self.occupied(CELL_WIDTH * 1.5, CELL_HEIGHT * 1.5 - 10, 8)
+        self.assertEqual(cells, {(1, 1)})
+
+    def test_asteroid_crossing_cell_boundaries(self):
+        # Centred on the corner shared by rows 1-2 and columns 1-2
+        cells = self.occupied(CELL_WIDTH * 2, CELL_HEIGHT * 2, 20)
+        self.assertEqual(cells, {(1, 1), (1, 2), (2, 1), (2, 2)})
+
+    def test_asteroid_crossing_the_screen_edge(self):
+        # Pokes out of the left edge, so it also covers the last column, and over the top edge
+        cells = self.occupied(5, 5, 15)
+        self.assertEqual(cells, {(0, 0), (0, GRID - 1), (GRID - 1, 0), (GRID - 1, GRID - 1)})
+
+
+if __name__ == "__main__":
+    unittest.main()
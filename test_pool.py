@@ -0,0 +1,58 @@
+import unittest
+import pygame
+from asteroid import Asteroid
+from logger import configure_event_log
+from rocket import Rocket
+from world import World
+
+
+class RecycledTargetTest(unittest.TestCase):
+    """A pooled asteroid that dies while a rocket chases it comes back unclaimed."""
+
+    def setUp(self):
+        configure_event_log(False)
+        self.addCleanup(configure_event_log, True)
+        self.world = World(seed=1)
+        self.origin = pygame.Vector2(100, 100)
+
+    def acquire(self):
+        self.world.target_grid.rebuild(self.world.asteroids)
+        return Rocket.acquire_targets(self.origin, 1)
+
+    def fire_at(self, asteroid):
+        rocket = Rocket(self.origin.x, self.origin.y, 0, pygame.Vector2())
+        rocket.target = asteroid
+        rocket.target_id = asteroid.entity_id
+        self.world.taken_targets.add(asteroid)
+        return rocket
+
+    def test_kill_reuse_acquire(self):
+        asteroid = Asteroid.create(120, 100, 20)
+        self.assertEqual(self.acquire(), [asteroid])
+        self.assertIn(asteroid, self.world.taken_targets)
+
+        asteroid.kill()
+        self.assertNotIn(asteroid, self.world.taken_targets)
+        recycled = Asteroid.create(130, 100, 20)
+        self.assertIs(recycled, asteroid)
+        Asteroid.create(600, 600, 20)  # Further away, only picked if the recycled one counts as taken
+        self.assertEqual(self.acquire(), [recycled])
+
+    def test_old_chaser_keeps_off_the_new_claim(self):
+        asteroid = Asteroid.create(120, 100, 20)
+        chaser = self.fire_at(asteroid)
+        asteroid.kill()
+        recycled = Asteroid.create(130, 100, 20)
+        self.assertIs(recycled, asteroid)
+        self.fire_at(recycled)
+        other = Asteroid.create(600, 600, 20)
+
+        # The first rocket notices its asteroid was replaced and looks elsewhere
+        self.world.target_grid.rebuild(self.world.asteroids)
+        chaser.update(1 / 60)
+        self.assertIs(chaser.target, other)
+        self.assertIn(recycled, self.world.taken_targets)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from constants import SIMULATION_DT
+from headless import random_policy
+from input_recording import INPUT_RECORD
+from logger import configure_event_log
+from replay_archive import ReplayArchive, ReplayWriter
+from world import World
+
+FRAMES = 400
+KEYFRAME_SECONDS = 1.0
+
+
+def gameplay_state(world):
+    """What a seek must reproduce; entity ids and rocket targets are renumbered by a restore."""
+    snapshot = world.snapshot()
+    entities = snapshot["entities"].copy()
+    entities["id"] = 0
+    entities["target"] = 0
+    return (snapshot["frame"], snapshot["score"], snapshot["lives"], snapshot["game_over"],
+            snapshot["random"], entities.tobytes())
+
+
+class TruncatedArchiveTest(unittest.TestCase):
+    """An archive cut off mid-game (no index, partial segment) still opens and seeks."""
+
+    @classmethod
+    def setUpClass(cls):
+        configure_event_log(False)
+        cls.directory = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.directory, "game.pyrp")
+        random.seed(7)
+        world = World(seed=42, effects=False)
+        world.lives = FRAMES  # Keep the game going for the whole recording
+        writer = ReplayWriter(cls.path, 42, world, KEYFRAME_SECONDS)
+        cls.states = [gameplay_state(world)]
+        for _ in range(FRAMES):
+            inputs = random_policy(world)
+            writer.record(inputs, SIMULATION_DT)
+            world.step(SIMULATION_DT, inputs)
+            cls.states.append(gameplay_state(world))
+        writer.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+        configure_event_log(True)
+
+    def truncated(self, size):
+        path = os.path.join(self.directory, f"cut-{size}.pyrp")
+        with open(self.path, "rb") as source, open(path, "wb") as target:
+            target.write(source.read(size))
+        archive = ReplayArchive(path)
+        self.addCleanup(archive.close)
+        return archive
+
+    def assert_seeks(self, archive):
+        frames = {0, 1, 59, 60, 61, len(archive) // 2, len(archive)}
+        for frame in sorted(frame for frame in frames if frame <= len(archive)):
+            with self.subTest(frame=frame):
+                self.assertEqual(gameplay_state(archive.seek(frame, effects=False)), self.states[frame])
+
+    def test_closed_archive_uses_its_index(self):
+        with ReplayArchive(self.path) as archive:
+            self.assertFalse(archive.recovered)
+            self.assertEqual(len(archive), FRAMES)
+            self.assert_seeks(archive)
+
+    def test_truncated_archive_is_rebuilt_from_segments(self):
+        size = os.path.getsize(self.path)
+        full = ReplayArchive(self.path)
+        self.addCleanup(full.close)
+        index_offset = int(full.index[-1]["records_offset"] + full.index[-1]["records"] * INPUT_RECORD.size)
+        for cut in (size * 3 // 10, size * 11 // 20, size * 4 // 5, index_offset - 4, size - 1):
+            with self.subTest(cut=cut):
+                archive = self.truncated(cut)
+                self.assertTrue(archive.recovered)
+                self.assertGreater(len(archive), 0)
+                self.assertLessEqual(len(archive), FRAMES)
+                self.assert_seeks(archive)
+
+    def test_archive_cut_inside_a_keyframe_keeps_the_earlier_segments(self):
+        with ReplayArchive(self.path) as full:
+            second = full.index[1]
+            cut = int(second["keyframe_offset"]) + 10
+        archive = self.truncated(cut)
+        self.assertEqual(len(archive.index), 1)
+        self.assertEqual(len(archive), int(second["frame"]))
+        self.assert_seeks(archive)
+
+
+if __name__ == "__main__":
+    unittest.main()
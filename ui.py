@@ -1,6 +1,7 @@
-import random
 import pygame
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+import profiler
+import rng
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, PROFILER_OVERLAY_REFRESH_FRAMES
 from asteroid import Asteroid
 from starfield import Starfield
 
@@ -10,6 +11,16 @@ STATE_PLAYING = 1
 STATE_PAUSED = 2
 STATE_GAME_OVER = 3
 
+# HUD layout: lines stacked top-down in the left and right corners
+HUD_LINE_SPACING = 35
+HUD_LEFT_SLOTS = ("score", "lives", "warp", "shield", "speed")
+HUD_RIGHT_SLOTS = ("rockets", "mines")
+
+# Profiler overlay: a table in the bottom-left corner
+PROFILER_LINE_SPACING = 18
+PROFILER_COLUMNS = (("phase", 0), ("mean", 200), ("p95", 260), ("p99", 320))  # Header, x offset
+PROFILER_PANEL_WIDTH = 375
+
 
 class UI:
     def __init__(self):
@@ -17,17 +28,23 @@ class UI:
         self.title_font = pygame.font.Font(None, 72)
         self.menu_asteroids = self._init_menu_asteroids()
         self.menu_starfield = Starfield(ambient_mode=True)
+        self.hud_lines = {}  # Slot -> (text, color, rendered surface)
+        self.hud_left = None
+        self.hud_right = None
+        self.profiler_font = pygame.font.Font(None, 22)
+        self.profiler_panel = None
+        self.profiler_refresh = 0  # Frames until the overlay is re-rendered
 
     def _init_menu_asteroids(self):
         menu_asteroids = []
         for _ in range(12):
-            x = random.randint(0, SCREEN_WIDTH)
-            y = random.randint(0, SCREEN_HEIGHT)
-            radius = random.randint(20, 60)
+            x = rng.cosmetic.randint(0, SCREEN_WIDTH)
+            y = rng.cosmetic.randint(0, SCREEN_HEIGHT)
+            radius = rng.cosmetic.randint(20, 60)
             asteroid = Asteroid(x, y, radius)
             asteroid.velocity = pygame.Vector2(
-                random.uniform(-50, 50),
-                random.uniform(-50, 50)
+                rng.cosmetic.uniform(-50, 50),
+                rng.cosmetic.uniform(-50, 50)
             )
             menu_asteroids.append(asteroid)
         return menu_asteroids
@@ -106,49 +123,109 @@ class UI:
         self._draw_centered_text(screen, "Press SPACE to Play Again", SCREEN_HEIGHT // 2 + 50)
         self._draw_centered_text(screen, "Press ESC for Menu", SCREEN_HEIGHT // 2 + 100, 'gray')
 
+    def _hud_line(self, slot, text, color):
+        """Render a HUD line only when its string or color changed; returns True if it did."""
+        cached = self.hud_lines.get(slot)
+        if cached is not None and cached[0] == text and cached[1] == color:
+            return False
+        self.hud_lines[slot] = (text, color, self.font.render(text, True, color))
+        return True
+
+    def _build_hud_layer(self, slots, align_right=False):
+        """Composite a column of HUD lines onto one transparent surface."""
+        surfaces = [self.hud_lines[slot][2] for slot in slots]
+        width = max(surface.get_width() for surface in surfaces)
+        height = HUD_LINE_SPACING * (len(surfaces) - 1) + surfaces[-1].get_height()
+        layer = pygame.Surface((width, height), pygame.SRCALPHA)
+        for index, surface in enumerate(surfaces):
+            x = width - surface.get_width() if align_right else 0
+            # Lines never overlap, so MAX copies text pixels and alpha unchanged
+            layer.blit(surface, (x, index * HUD_LINE_SPACING), special_flags=pygame.BLEND_RGBA_MAX)
+        return layer
+
     def draw_hud(self, screen, score, lives, warp_cooldown=0, warp_charging=False, warp_charge_remaining=0, has_shield=False, speed_boost_remaining=0, rocket_ammo=0, mine_ammo=0):
-        score_text = self.font.render(f"Score: {score}", True, 'white')
-        screen.blit(score_text, (10, 10))
-        
-        lives_text = self.font.render(f"Lives: {lives}", True, 'white')
-        screen.blit(lives_text, (10, 45))
-        
         # Warp cooldown indicator
         if warp_cooldown > 0:
-            warp_text = self.font.render(f"WARP: {warp_cooldown:.1f}s", True, 'gray')
+            warp = (f"WARP: {warp_cooldown:.1f}s", 'gray')
         elif warp_charging:
-            warp_text = self.font.render(f"WARP: {warp_charge_remaining:.1f}s", True, 'yellow')
+            warp = (f"WARP: {warp_charge_remaining:.1f}s", 'yellow')
         else:
-            warp_text = self.font.render("WARP: READY [SHIFT]", True, 'cyan')
-        screen.blit(warp_text, (10, 80))
+            warp = ("WARP: READY [SHIFT]", 'cyan')
         
         # Shield indicator
         if has_shield:
-            shield_text = self.font.render("SHIELD: ACTIVE", True, 'deepskyblue')
+            shield = ("SHIELD: ACTIVE", 'deepskyblue')
         else:
-            shield_text = self.font.render("SHIELD: ---", True, 'gray')
-        screen.blit(shield_text, (10, 115))
+            shield = ("SHIELD: ---", 'gray')
         
         # Speed boost indicator
         if speed_boost_remaining > 0:
-            speed_text = self.font.render(f"SPEED: {speed_boost_remaining:.1f}s", True, 'lime')
+            speed = (f"SPEED: {speed_boost_remaining:.1f}s", 'lime')
         else:
-            speed_text = self.font.render("SPEED: ---", True, 'gray')
-        screen.blit(speed_text, (10, 150))
+            speed = ("SPEED: ---", 'gray')
         
         # Weapon ammo indicators (right side)
-        # Rockets [1]
         if rocket_ammo > 0:
-            rocket_text = self.font.render(f"[1] ROCKETS: {rocket_ammo}", True, 'orange')
+            rockets = (f"[1] ROCKETS: {rocket_ammo}", 'orange')
         else:
-            rocket_text = self.font.render("[1] ROCKETS: ---", True, 'gray')
-        rocket_rect = rocket_text.get_rect(topright=(SCREEN_WIDTH - 10, 10))
-        screen.blit(rocket_text, rocket_rect)
-        
-        # Mines [2]
+            rockets = ("[1] ROCKETS: ---", 'gray')
         if mine_ammo > 0:
-            mine_text = self.font.render(f"[2] MINES: {mine_ammo}", True, 'red')
+            mines = (f"[2] MINES: {mine_ammo}", 'red')
         else:
-            mine_text = self.font.render("[2] MINES: ---", True, 'gray')
-        mine_rect = mine_text.get_rect(topright=(SCREEN_WIDTH - 10, 45))
-        screen.blit(mine_text, mine_rect)
+            mines = ("[2] MINES: ---", 'gray')
+        
+        left_dirty = self._hud_line("score", f"Score: {score}", 'white')
+        left_dirty |= self._hud_line("lives", f"Lives: {lives}", 'white')
+        left_dirty |= self._hud_line("warp", *warp)
+        left_dirty |= self._hud_line("shield", *shield)
+        left_dirty |= self._hud_line("speed", *speed)
+        right_dirty = self._hud_line("rockets", *rockets)
+        right_dirty |= self._hud_line("mines", *mines)
+        
+        # The composited layers only change when one of their lines did
+        if left_dirty or self.hud_left is None:
+            self.hud_left = self._build_hud_layer(HUD_LEFT_SLOTS)
+        if right_dirty or self.hud_right is None:
+            self.hud_right = self._build_hud_layer(HUD_RIGHT_SLOTS, align_right=True)
+        
+        screen.blit(self.hud_left, (10, 10))
+        screen.blit(self.hud_right, (SCREEN_WIDTH - 10 - self.hud_right.get_width(), 10))
+
+    def get_hud_rects(self):
+        """Screen rects of the HUD layers drawn by the last draw_hud()."""
+        if self.hud_left is None:
+            return []
+        right = self.hud_right.get_rect(topright=(SCREEN_WIDTH - 10, 10))
+        return [self.hud_left.get_rect(topleft=(10, 10)), right]
+
+    def get_menu_rects(self):
+        """Rects of the animated parts of the menu and game over screens (the text is static)."""
+        rects = self.menu_starfield.get_draw_rects()
+        for asteroid in self.menu_asteroids:
+            rects.extend(asteroid.get_draw_rects())
+        return rects
+
+    def _build_profiler_panel(self, rows):
+        """Render the phase timing table (milliseconds) onto a translucent panel."""
+        height = PROFILER_LINE_SPACING * (len(rows) + 1) + 10
+        panel = pygame.Surface((PROFILER_PANEL_WIDTH, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        lines = [([header for header, _ in PROFILER_COLUMNS], 'gray')]
+        lines += [([name, f"{mean:.2f}", f"{p95:.2f}", f"{p99:.2f}"], 'white') for name, mean, p95, p99 in rows]
+        for index, (cells, color) in enumerate(lines):
+            y = 5 + index * PROFILER_LINE_SPACING
+            for text, (_, x) in zip(cells, PROFILER_COLUMNS):
+                panel.blit(self.profiler_font.render(text, True, color), (5 + x, y))
+        return panel
+
+    def draw_profiler(self, screen):
+        """Draw the profiler overlay, refreshing its numbers every few frames."""
+        self.profiler_refresh -= 1
+        if self.profiler_panel is None or self.profiler_refresh <= 0:
+            self.profiler_panel = self._build_profiler_panel(profiler.summary())
+            self.profiler_refresh = PROFILER_OVERLAY_REFRESH_FRAMES
+        screen.blit(self.profiler_panel, self.get_profiler_rect())
+
+    def get_profiler_rect(self):
+        """Screen rect of the profiler overlay drawn by the last draw_profiler()."""
+        return self.profiler_panel.get_rect(bottomleft=(10, SCREEN_HEIGHT - 10))
@@ -0,0 +1,184 @@
+import multiprocessing
+import os
+import traceback
+from multiprocessing import shared_memory
+import numpy as np
+from constants import SIMULATION_DT
+from logger import configure_event_log
+from observation import ObservationEncoder
+from player_input import PlayerInput
+from world import World
+
+# Commands sent to workers as raw bytes; replies are b"ok" or b"error" + traceback
+_STEP = b"step"
+_RESET = b"reset"
+_CLOSE = b"close"
+_OK = b"ok"
+_ERROR = b"error"
+
+
+class _Buffers:
+    """NumPy views over the shared-memory blocks every process exchanges data through."""
+
+    def __init__(self, num_envs, obs_size, names=None):
+        self.layout = {  # Name -> (dtype, shape)
+            "actions": (np.uint8, (num_envs,)),
+            "observations": (np.float32, (num_envs, obs_size)),
+            "rewards": (np.float32, (num_envs,)),
+            "dones": (np.bool_, (num_envs,)),
+        }
+        self.blocks = {}
+        for name, (dtype, shape) in self.layout.items():
+            if names is None:
+                size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+                block = shared_memory.SharedMemory(create=True, size=size)
+            else:
+                # The creating process owns cleanup, so workers stay off the resource tracker
+                block = shared_memory.SharedMemory(name=names[name], track=False)
+            self.blocks[name] = block
+            setattr(self, name, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+
+    def names(self):
+        return {name: block.name for name, block in self.blocks.items()}
+
+    def close(self, unlink=False):
+        for name in self.layout:
+            setattr(self, name, None)  # Views must go before the mapping can close
+        for block in self.blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                pass  # The caller still holds an array; the mapping goes when that does
+            if unlink:
+                block.unlink()
+
+
+def _worker(conn, names, num_envs, first, count, encoder, seed, dt, frame_skip):
+    """Own worlds first..first+count-1 and step them whenever the parent asks."""
+    configure_event_log(False)
+    buffers = _Buffers(num_envs, encoder.size, names)
+    envs = range(first, first + count)
+    worlds = {}
+    games = dict.fromkeys(envs, 0)  # Games started per env, so every game gets its own seed
+
+    def new_world(env):
+        games[env] += 1
+        return World(None if seed is None else f"{seed}:{env}:{games[env]}", effects=False)
+
+    def reset():
+        for env in envs:
+            worlds[env] = world = new_world(env)
+            encoder.encode(world, buffers.observations[env])
+        buffers.rewards[first:first + count] = 0
+        buffers.dones[first:first + count] = False
+
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command == _STEP:
+                for env in envs:
+                    world = worlds[env]
+                    world.activate()
+                    inputs = PlayerInput.from_bits(buffers.actions[env])
+                    score = world.score
+                    for _ in range(frame_skip):
+                        world.step(dt, inputs)
+                        if world.game_over:
+                            break
+                    buffers.rewards[env] = world.score - score
+                    buffers.dones[env] = world.game_over
+                    if world.game_over:
+                        # Auto-reset: the observation is the first one of the next game
+                        worlds[env] = world = new_world(env)
+                    encoder.encode(world, buffers.observations[env])
+            elif command == _RESET:
+                reset()
+            elif command == _CLOSE:
+                break
+            conn.send_bytes(_OK)
+    except Exception:
+        conn.send_bytes(_ERROR + traceback.format_exc().encode())
+    finally:
+        buffers.close()
+        conn.close()
+
+
+class VectorEnv:
+    """N independent games stepped in lock-step across worker processes.
+
+    Actions are one PlayerInput bitmask (see PlayerInput.to_bits) per game;
+    observations come from `encoder` (an ObservationEncoder by default).
+    step() returns (observations, rewards, dones): rewards are score
+    deltas, and a game that ends is restarted straight away, so its row
+    already holds the next game's first observation. The returned arrays
+    live in shared memory and are overwritten by the next call; copy them
+    to keep them. Workers only ever receive a few command bytes, so nothing
+    is pickled per step. Games run without visual effects, and with a seed
+    every game is reproducible whatever the number of workers.
+    """
+
+    def __init__(self, num_envs, num_workers=None, seed=None, dt=SIMULATION_DT, frame_skip=1,
+                 encoder=None, context=None):
+        self.num_envs = num_envs
+        self.encoder = encoder or ObservationEncoder()
+        num_workers = min(num_envs, num_workers or os.cpu_count() or 1)
+        self.buffers = _Buffers(num_envs, self.encoder.size)
+        ctx = multiprocessing.get_context(context)
+        self.connections = []
+        self.workers = []
+        first = 0
+        for index in range(num_workers):
+            # Spread games as evenly as possible over the workers
+            count = num_envs // num_workers + (index < num_envs % num_workers)
+            parent, child = ctx.Pipe()
+            worker = ctx.Process(target=_worker, daemon=True,
+                                 args=(child, self.buffers.names(), num_envs, first, count, self.encoder,
+                                       seed, dt, frame_skip))
+            worker.start()
+            child.close()
+            self.connections.append(parent)
+            self.workers.append(worker)
+            first += count
+        self.closed = False
+
+    def _broadcast(self, command):
+        for conn in self.connections:
+            conn.send_bytes(command)
+        for conn in self.connections:
+            reply = conn.recv_bytes()
+            if reply != _OK:
+                raise RuntimeError("vector env worker failed:\n" + reply[len(_ERROR):].decode())
+
+    def reset(self):
+        """Start a fresh game everywhere; returns the observations."""
+        self._broadcast(_RESET)
+        return self.buffers.observations
+
+    def step(self, actions):
+        """Apply one bitmask per game for one step (frame_skip frames)."""
+        self.buffers.actions[:] = actions
+        self._broadcast(_STEP)
+        return self.buffers.observations, self.buffers.rewards, self.buffers.dones
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self.connections:
+            try:
+                conn.send_bytes(_CLOSE)
+            except OSError:
+                pass
+        for worker in self.workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        for conn in self.connections:
+            conn.close()
+        self.buffers.close(unlink=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
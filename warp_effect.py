@@ -1,7 +1,6 @@
-import random
 import math
 import pygame
-from particle import Particle
+import rng
 from particle_effect import ParticleEffect
 
 
@@ -15,6 +14,8 @@ class WarpEffect(ParticleEffect):
 
     def trigger(self, start_x, start_y, end_x, end_y, direction):
         """Create warp particles at origin and destination."""
+        if not self.enabled:
+            return
         # Particles burst outward at start position (disappearing effect)
         self._create_burst(start_x, start_y, outward=True)
         
@@ -27,19 +28,21 @@ class WarpEffect(ParticleEffect):
     def _create_burst(self, x, y, outward=True):
         """Create a circular burst of particles."""
         count = 20
+        speeds, angles, lifetimes, sizes, colors = [], [], [], [], []
         for i in range(count):
-            angle = (2 * math.pi * i) / count + random.uniform(-0.2, 0.2)
-            speed = random.uniform(100, 200) if outward else random.uniform(50, 100)
+            angle = (2 * math.pi * i) / count + rng.cosmetic.uniform(-0.2, 0.2)
+            speed = rng.cosmetic.uniform(100, 200) if outward else rng.cosmetic.uniform(50, 100)
             
             # For inward burst, reverse the direction
             if not outward:
                 angle += math.pi
             
-            lifetime = random.uniform(0.3, 0.5)
-            color = random.choice(self.WARP_COLORS)
-            size = random.uniform(2, 4)
-            particle = Particle.create_radial(x, y, color, speed, angle, lifetime, size)
-            self._add_particle(particle)
+            angles.append(angle)
+            speeds.append(speed)
+            lifetimes.append(rng.cosmetic.uniform(0.3, 0.5))
+            colors.append(rng.cosmetic.choice(self.WARP_COLORS))
+            sizes.append(rng.cosmetic.uniform(2, 4))
+        self._emit_radial(x, y, speeds, angles, lifetimes, sizes, colors)
 
     def _create_trail(self, start_x, start_y, end_x, end_y):
         """Create particles along the warp trajectory."""
@@ -56,22 +59,24 @@ class WarpEffect(ParticleEffect):
         
         # Create particles along the path
         num_trail_particles = int(distance / 10)
+        xs, ys, speeds, angles, lifetimes, sizes, colors = [], [], [], [], [], [], []
         for i in range(num_trail_particles):
             t = i / max(1, num_trail_particles - 1)
             px = start_x + dx * t
             py = start_y + dy * t
             
             # Add some perpendicular offset for a wider trail
-            perp_offset = random.uniform(-15, 15)
+            perp_offset = rng.cosmetic.uniform(-15, 15)
             px += -ny * perp_offset
             py += nx * perp_offset
             
             # Trail particles move perpendicular to warp direction
-            angle = math.atan2(ny, nx) + math.pi / 2 + random.uniform(-0.5, 0.5)
-            speed = random.uniform(30, 80)
-            lifetime = random.uniform(0.2, 0.4)
-            color = random.choice(self.WARP_COLORS)
-            size = random.uniform(1, 3)
-            
-            particle = Particle.create_radial(px, py, color, speed, angle, lifetime, size)
-            self._add_particle(particle)
+            xs.append(px)
+            ys.append(py)
+            angles.append(math.atan2(ny, nx) + math.pi / 2 + rng.cosmetic.uniform(-0.5, 0.5))
+            speeds.append(rng.cosmetic.uniform(30, 80))
+            lifetimes.append(rng.cosmetic.uniform(0.2, 0.4))
+            colors.append(rng.cosmetic.choice(self.WARP_COLORS))
+            sizes.append(rng.cosmetic.uniform(1, 3))
+        
+        self._emit_radial(xs, ys, speeds, angles, lifetimes, sizes, colors)
@@ -0,0 +1,378 @@
+import itertools
+import pygame
+import profiler
+import rng
+from circleshape import CircleShape
+from player import Player
+from logger import log_event, register_group, register_entity, clear_registry, set_frame
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, ASTEROID_MIN_RADIUS,
+                       SCORE_SMALL_ASTEROID, SCORE_MEDIUM_ASTEROID, SCORE_LARGE_ASTEROID,
+                       PLAYER_LIVES, PLAYER_WARP_TIME_SCALE, POWERUP_SPAWN_CHANCE,
+                       SHIELD_SPAWN_WEIGHT, SPEED_SPAWN_WEIGHT,
+                       SHAKE_HIT_INTENSITY, SHAKE_WARP_INTENSITY, SHAKE_EXPLOSION_INTENSITY,
+                       WEAPON_PICKUP_SPAWN_CHANCE, ROCKET_SPAWN_WEIGHT, MINE_SPAWN_WEIGHT,
+                       BROADPHASE_LOG_INTERVAL_FRAMES)
+from asteroid import Asteroid
+from asteroidfield import AsteroidField
+from shot import Shot
+from explosion import AsteroidExplosion, ShipExplosion, ShieldExplosion
+from shield_powerup import ShieldPowerUp
+from speed_powerup import SpeedPowerUp
+from screen_shake import ScreenShake
+from rocket import Rocket, RocketExplosion
+from mine import Mine, MineExplosion
+from rocket_pickup import RocketPickup
+from mine_pickup import MinePickup
+from spatial_hash import SpatialHash
+from collision import CollisionSystem
+from command_buffer import CommandBuffer
+from area_effect import AreaEffects
+from particle_system import ParticleSystem
+from particle_effect import ParticleEffect
+from snapshot_store import ENTITY_TYPES, build_entity_states
+
+# How restore() rebuilds each entity type in snapshot_store.ENTITY_TYPES before
+# putting its state back; the player is never rebuilt
+_ENTITY_FACTORIES = {
+    "Asteroid": lambda x, y, radius: Asteroid.create(x, y, radius),
+    "Shot": lambda x, y, radius: Shot.create(x, y),
+    "Rocket": lambda x, y, radius: Rocket(x, y, 0, pygame.Vector2()),
+    "Mine": lambda x, y, radius: Mine(x, y, pygame.Vector2()),
+    "ShieldPowerUp": lambda x, y, radius: ShieldPowerUp(x, y),
+    "SpeedPowerUp": lambda x, y, radius: SpeedPowerUp(x, y),
+    "RocketPickup": lambda x, y, radius: RocketPickup(x, y),
+    "MinePickup": lambda x, y, radius: MinePickup(x, y),
+}
+
+
+class World:
+    """Game simulation (entities, collisions, scoring) with no display attached.
+    
+    Sprites register themselves through class-level `containers`; several
+    worlds can share a process as long as each is activate()d before it is
+    stepped.
+    
+    Randomness comes from the world's own RandomStreams, so a seeded world
+    replays exactly. With effects=False no particles, explosions or other
+    purely visual sprites are created at all, and the game plays out the same.
+    """
+    
+    def __init__(self, seed=None, effects=True):
+        self.random = rng.RandomStreams(seed)
+        self.effects = effects
+        rng.use(self.random)  # Before anything below draws a random number
+        self.updatable = pygame.sprite.Group()
+        self.drawable = pygame.sprite.Group()
+        self.asteroids = pygame.sprite.Group()
+        self.shots = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+        self.rockets = pygame.sprite.Group()
+        self.mines = pygame.sprite.Group()
+        self.score = 0
+        self.lives = PLAYER_LIVES
+        self.game_over = False
+        self.frame = 0
+        self.warp_held = False  # Warp input from the previous step, for press/release edges
+        self.screen_shake = ScreenShake()  # Gameplay adds shake, the client decays and applies it
+        self.commands = CommandBuffer()  # Structural changes from collisions, applied at the end of the step
+        self.collisions = CollisionSystem(self.updatable, live=self.commands.is_live)
+        self.broadphase_totals = {"frames": 0, "pair_tests": 0, "naive_pair_tests": 0}  # Since the last event
+        self._register_collisions()
+        self.area_effects = AreaEffects(self.collisions.grid)
+        self.target_grid = SpatialHash()  # Asteroids as of the start of the step, for rocket targeting
+        self.taken_targets = set()  # Asteroids already chased by a rocket
+        
+        self._bind_containers()
+        # Created first so particles integrate before emitters run and draw behind every sprite
+        self.particles = ParticleSystem()
+        self.asteroid_field = AsteroidField()
+        self.player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.activate()
+    
+    def activate(self):
+        """Point the sprite classes' shared state at this world.
+        
+        Call it before stepping (or spawning into) this world whenever another
+        world in the same process may have been used since.
+        """
+        self._bind_containers()
+        rng.use(self.random)
+        ParticleEffect.particle_system = self.particles
+        ParticleEffect.enabled = self.effects
+        # Note: player.position is a Vector2, which is mutable and shared by reference
+        Rocket.player_ref = self.player  # Rockets target asteroids nearest to player
+        self._register_with_logger()
+    
+    def _bind_containers(self):
+        """Point every sprite class at this world's groups."""
+        updatable, drawable = self.updatable, self.drawable
+        asteroids, shots, powerups = self.asteroids, self.shots, self.powerups
+        Asteroid.containers = (asteroids, updatable, drawable)
+        Asteroid.asteroids_group = asteroids
+        Asteroid.commands = self.commands
+        Asteroid.taken_targets = self.taken_targets
+        AsteroidField.containers = (updatable,)
+        AsteroidField.asteroids_group = asteroids
+        Shot.containers = (shots, updatable, drawable)
+        AsteroidExplosion.containers = (updatable, drawable)
+        ShipExplosion.containers = (updatable, drawable)
+        ShieldExplosion.containers = (updatable, drawable)
+        RocketExplosion.containers = (updatable, drawable)
+        MineExplosion.containers = (updatable, drawable)
+        ShieldPowerUp.containers = (powerups, updatable, drawable)
+        SpeedPowerUp.containers = (powerups, updatable, drawable)
+        RocketPickup.containers = (powerups, updatable, drawable)
+        MinePickup.containers = (powerups, updatable, drawable)
+        Rocket.containers = (self.rockets, updatable, drawable)
+        Rocket.asteroids_group = asteroids
+        Rocket.taken_targets = self.taken_targets
+        Rocket.asteroid_index = self.target_grid
+        Mine.containers = (self.mines, updatable, drawable)
+        Player.containers = (updatable, drawable)
+        ParticleSystem.containers = (updatable, drawable)
+    
+    def _register_with_logger(self):
+        """Hand the state logger the groups and player it should snapshot."""
+        clear_registry()
+        register_entity("player", self.player)
+        register_group("asteroids", self.asteroids)
+        register_group("shots", self.shots)
+        register_group("rockets", self.rockets)
+        register_group("mines", self.mines)
+        register_group("powerups", self.powerups)
+    
+    def snapshot(self):
+        """Everything that decides how this game goes on, as plain data for restore().
+        
+        Entities (snapshot_store.ENTITY_STATE_DTYPE rows) are in update order,
+        so a restored world iterates, collides and draws random numbers in
+        the same order. Visual effects are left out.
+        """
+        return {
+            "frame": self.frame,
+            "score": self.score,
+            "lives": self.lives,
+            "game_over": self.game_over,
+            "warp_held": self.warp_held,
+            "spawn_timer": self.asteroid_field.spawn_timer,
+            "shake": self.screen_shake.intensity,
+            "random": self.random.getstate(),
+            "entities": build_entity_states(self.updatable, self.taken_targets),
+        }
+    
+    def restore(self, snapshot):
+        """Replace this world's game with one taken by snapshot(); stepping on plays it out exactly."""
+        self.activate()
+        persistent = (self.particles, self.asteroid_field, self.player)
+        for sprite in self.updatable.sprites():
+            if sprite not in persistent:
+                sprite.kill()
+        self.particles.clear()
+        self.taken_targets.clear()
+        
+        by_id = {}
+        targets = []  # (rocket, target id)
+        for row in snapshot["entities"]:
+            code, entity_id, x, y, vx, vy, radius, rotation, target, taken, _ = row.tolist()
+            name = ENTITY_TYPES[code]
+            if name == "Player":
+                sprite = self.player
+            else:
+                sprite = _ENTITY_FACTORIES[name](x, y, radius)
+            sprite.entity_id = entity_id
+            sprite.position = pygame.Vector2(x, y)
+            sprite.velocity = pygame.Vector2(vx, vy)
+            sprite.radius = radius
+            if hasattr(sprite, "rotation"):
+                sprite.rotation = rotation
+            sprite.set_state(row["state"].tolist())
+            by_id[entity_id] = sprite
+            if taken:
+                self.taken_targets.add(sprite)
+            if name == "Rocket":
+                targets.append((sprite, target))
+        for rocket, target in targets:
+            rocket.target = by_id.get(target)
+        if by_id:
+            # New entities must not reuse a restored id (rockets compare them)
+            CircleShape._next_id = itertools.count(max(next(CircleShape._next_id), max(by_id) + 1))
+        
+        self.frame = snapshot["frame"]
+        self.score = snapshot["score"]
+        self.lives = snapshot["lives"]
+        self.game_over = snapshot["game_over"]
+        self.warp_held = snapshot["warp_held"]
+        self.asteroid_field.spawn_timer = snapshot["spawn_timer"]
+        self.screen_shake.intensity = snapshot["shake"]
+        # Last, since rebuilding entities above draws random numbers
+        self.random.setstate(snapshot["random"])
+    
+    def step(self, dt, inputs):
+        """Advance the simulation by dt seconds of real time using the given inputs."""
+        player = self.player
+        self.frame += 1
+        set_frame(self.frame)  # Events from this step line up with replays of it
+        
+        # Warp charges while held and fires on release
+        if inputs.warp and not self.warp_held:
+            player.start_warp_charge()
+        elif not inputs.warp and self.warp_held:
+            player.release_warp()
+        self.warp_held = inputs.warp
+        
+        # Apply time slowdown when charging warp
+        game_dt = dt
+        if player.is_warp_charging():
+            game_dt = dt * PLAYER_WARP_TIME_SCALE
+        
+        # Update warp charge timer (uses real time, not slowed time)
+        with profiler.phase("warp charge"):
+            warp_executed = player.update_warp_charge(dt)
+        if warp_executed:
+            self.screen_shake.add_shake(SHAKE_WARP_INTENSITY)
+        
+        player.controls = inputs
+        with profiler.phase("update"):
+            self.target_grid.rebuild(self.asteroids)
+            self.updatable.update(game_dt)
+        
+        # Clear fired projectiles list (they auto-add via containers)
+        player.get_fired_projectiles()
+        
+        with profiler.phase("collisions"):
+            self._handle_collisions()
+        # Sync point: everything killed or spawned by collisions takes effect here
+        with profiler.phase("commands"):
+            self.commands.flush()
+    
+    def _register_collisions(self):
+        """Layer pairs that interact, in the order their contacts are resolved."""
+        collisions = self.collisions
+        collisions.register("asteroid", "asteroid", self._on_asteroid_asteroid)
+        collisions.register("player", "asteroid", self._on_player_asteroid,
+                            test=lambda player, asteroid: player.collides_with_circle(asteroid))
+        collisions.register("asteroid", "shot", self._on_asteroid_shot)
+        collisions.register("rocket", "asteroid", self._on_rocket_asteroid)
+        collisions.register("mine", "asteroid", self._on_mine_asteroid)
+        collisions.register("player", "powerup", self._on_player_powerup)
+    
+    def _handle_collisions(self):
+        """Resolve all collisions for this frame and award points."""
+        self.collisions.run()
+        
+        # Destroy all asteroids caught in this frame's blasts; overlapping blasts hit each one once
+        for asteroid in self.area_effects.resolve(self._is_live_asteroid):
+            self._spawn_effect(AsteroidExplosion.create, asteroid.position.x, asteroid.position.y, asteroid.radius)
+            self.score += SCORE_MEDIUM_ASTEROID
+            asteroid.split()
+        
+        # One summary event per interval; the per-frame counts stay in self.collisions.stats
+        stats = self.collisions.stats
+        totals = self.broadphase_totals
+        totals["frames"] += 1
+        totals["pair_tests"] += stats["pair_tests"]
+        totals["naive_pair_tests"] += stats["naive_pair_tests"]
+        if totals["frames"] >= BROADPHASE_LOG_INTERVAL_FRAMES:
+            log_event("broadphase", **totals)
+            self.broadphase_totals = dict.fromkeys(totals, 0)
+    
+    def _spawn_effect(self, factory, *args):
+        """Queue a purely visual sprite, unless this world runs without effects."""
+        if self.effects:
+            self.commands.spawn(factory, *args)
+    
+    def _is_live_asteroid(self, shape):
+        return shape.collision_layer == "asteroid" and self.commands.is_live(shape)
+    
+    def _on_asteroid_asteroid(self, asteroid1, asteroid2):
+        log_event("asteroid_collision")
+        self._spawn_effect(AsteroidExplosion.create, asteroid1.position.x, asteroid1.position.y, asteroid1.radius)
+        self._spawn_effect(AsteroidExplosion.create, asteroid2.position.x, asteroid2.position.y, asteroid2.radius)
+        self.screen_shake.add_shake(SHAKE_EXPLOSION_INTENSITY)
+        asteroid1.split()
+        asteroid2.split()
+    
+    def _on_player_asteroid(self, player, asteroid):
+        # One hit per frame: a hit makes the player invincible or ends the game
+        if player.is_invincible() or self.game_over:
+            return
+        log_event("player_hit")
+        # Check if player has shield
+        if player.break_shield():
+            # Shield absorbs the hit
+            log_event("shield_break")
+            self._spawn_effect(ShieldExplosion.create, player.position.x, player.position.y)
+            self.screen_shake.add_shake(SHAKE_HIT_INTENSITY)
+            # Still push player away
+            knockback_dir = (player.position - asteroid.position).normalize()
+            player.take_hit(knockback_dir)
+        else:
+            # No shield - take damage
+            self._spawn_effect(ShipExplosion.create, player.position.x, player.position.y)
+            self.screen_shake.add_shake(SHAKE_HIT_INTENSITY * 2)
+            self.lives -= 1
+            if self.lives <= 0:
+                self.game_over = True
+            else:
+                # Push player away from asteroid
+                knockback_dir = (player.position - asteroid.position).normalize()
+                player.take_hit(knockback_dir)
+    
+    def _on_asteroid_shot(self, asteroid, shot):
+        log_event("asteroid_shot")
+        self._spawn_effect(AsteroidExplosion.create, asteroid.position.x, asteroid.position.y, asteroid.radius)
+        self.screen_shake.add_shake(SHAKE_EXPLOSION_INTENSITY * (asteroid.radius / ASTEROID_MIN_RADIUS) * 0.5)
+        # Award points based on asteroid size
+        if asteroid.radius <= ASTEROID_MIN_RADIUS:
+            self.score += SCORE_SMALL_ASTEROID
+        elif asteroid.radius <= ASTEROID_MIN_RADIUS * 2:
+            self.score += SCORE_MEDIUM_ASTEROID
+        else:
+            self.score += SCORE_LARGE_ASTEROID
+        
+        # Chance to spawn power-up (only on player kills)
+        if rng.gameplay.random() < POWERUP_SPAWN_CHANCE:
+            # Weighted random selection for power-up type
+            powerup_classes = [ShieldPowerUp, SpeedPowerUp]
+            weights = [SHIELD_SPAWN_WEIGHT, SPEED_SPAWN_WEIGHT]
+            PowerUpClass = rng.gameplay.choices(powerup_classes, weights=weights)[0]
+            self.commands.spawn(PowerUpClass, asteroid.position.x, asteroid.position.y)
+            log_event("powerup_spawn")
+        
+        # Chance to spawn weapon pickup
+        if rng.gameplay.random() < WEAPON_PICKUP_SPAWN_CHANCE:
+            weapon_classes = [RocketPickup, MinePickup]
+            weights = [ROCKET_SPAWN_WEIGHT, MINE_SPAWN_WEIGHT]
+            WeaponClass = rng.gameplay.choices(weapon_classes, weights=weights)[0]
+            self.commands.spawn(WeaponClass, asteroid.position.x, asteroid.position.y)
+            log_event("weapon_pickup_spawn")
+        
+        self.commands.kill(shot)
+        asteroid.split()
+    
+    def _on_rocket_asteroid(self, rocket, asteroid):
+        log_event("rocket_hit")
+        self._spawn_effect(RocketExplosion, rocket.position.x, rocket.position.y)
+        self.screen_shake.add_shake(SHAKE_EXPLOSION_INTENSITY * 2)
+        
+        # Destroy hit asteroid
+        self._spawn_effect(AsteroidExplosion.create, asteroid.position.x, asteroid.position.y, asteroid.radius)
+        self.score += SCORE_MEDIUM_ASTEROID
+        asteroid.split()
+        self.commands.kill(rocket)
+    
+    def _on_mine_asteroid(self, mine, asteroid):
+        if not mine.is_armed():
+            return
+        log_event("mine_explode")
+        explosion_radius = mine.get_explosion_radius()
+        self._spawn_effect(MineExplosion, mine.position.x, mine.position.y, explosion_radius)
+        self.screen_shake.add_shake(SHAKE_EXPLOSION_INTENSITY * 4)
+        # Damage is applied once all contacts are in, see _handle_collisions
+        self.area_effects.detonate(mine.position, explosion_radius)
+        self.commands.kill(mine)
+    
+    def _on_player_powerup(self, player, powerup):
+        log_event("powerup_collect", type=powerup.get_name())
+        powerup.apply(player)
+        self.commands.kill(powerup)